@@ -0,0 +1,9 @@
+"""Vercel entry point (see vercel.json): the Flask app from app.py, set up by its factory"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app import create_app  # noqa: E402
+
+app = create_app()
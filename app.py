@@ -1,28 +1,62 @@
 import os
-import requests
+import argparse
+import base64
+import calendar
 import json
-import feedparser
+import re
+import hashlib
+import hmac
+import sqlite3
 import textwrap
 import random
+import shutil
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont, ImageOps
-from bing_image_downloader import downloader
 from time import sleep
-from flask import Flask, render_template, request, redirect, url_for, jsonify
+from flask import Flask, render_template, request, redirect, url_for, jsonify, send_from_directory
 import urllib.parse  # For URL-encoding the prompt
-import edge_tts
-import asyncio # edge-tts is async
+import contextvars
+import logging
+import threading
+import multiprocessing
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 
-# Initialize Flask app
+# Initialize Flask app. create_app() does the filesystem setup; the heavy
+# pipeline dependencies (requests, feedparser, PIL, bing_image_downloader,
+# edge-tts and asyncio) are imported by the functions that use them, so a cold
+# start that only serves / never loads them. CHRONICAL_PRELOAD=1 imports them
+# all in create_app() instead, for long-running servers.
 app = Flask(__name__)
+PRELOAD_DEPENDENCIES = os.environ.get("CHRONICAL_PRELOAD", "0") == "1"
+PRELOADED_MODULES = ("requests", "feedparser", "PIL.Image", "PIL.ImageDraw", "PIL.ImageFont", "bing_image_downloader.downloader", "edge_tts", "asyncio")
+app_setup_lock = threading.Lock()
+app_ready = False
 
-# Ensure directories exist
-output_dir = Path("images")
-output_dir.mkdir(parents=True, exist_ok=True)
-os.makedirs('static/images', exist_ok=True)
+# Leveled logging; CHRONICAL_LOG_LEVEL=DEBUG shows per-entry and per-request detail
+LOG_LEVEL = os.environ.get("CHRONICAL_LOG_LEVEL", "INFO")
+logger = logging.getLogger("chronical")
+logger.setLevel(LOG_LEVEL)
+if not logger.handlers:
+    log_handler = logging.StreamHandler()
+    log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(threadName)s] %(message)s"))
+    logger.addHandler(log_handler)
+    logger.propagate = False
+
+# Per-stage latency histograms and event counters, exported on /metrics.
+# Requests with ?timing=1 (or every request, with TIMING_HEADER) get a
+# Server-Timing header; job status carries the job's own breakdown.
+METRIC_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+TIMING_HEADER = False
+stage_histograms = {}  # stage -> {"buckets", "sum", "count"}
+event_counters = {}  # (event, labels) -> count
+metrics_lock = threading.Lock()
+stage_timings = contextvars.ContextVar("stage_timings", default=None)
 
-# Track processed keywords to avoid repetition
-processed_keywords = set()
+# Working directories, created by ensure_directories()
+output_dir = Path("images")
+cache_dir = Path("cache")
 
 rss_feeds = [
     {"name": "General News", "url": "https://feeds.feedburner.com/NDTV-LatestNews"},
@@ -34,43 +68,509 @@ rss_feeds = [
     {"name": "Business", "url": "https://www.thehindu.com/business/Economy/feeder/default.rss"}
 ]
 
-# Keep track of processed entry counts per feed URL
-feed_entry_counts = {}
+# Per-session feed cursors (entry index sequence numbers), keyword dedup sets
+# and generation job records. "memory" keeps them in this process; "sqlite"
+# shares them between every worker process on the host.
+STATE_BACKEND = os.environ.get("CHRONICAL_STATE_BACKEND", "memory")
+STATE_DB_PATH = cache_dir / "state.sqlite3"
+STATE_SESSION_TTL_SECONDS = 24 * 3600
+STATE_EXPIRY_INTERVAL_SECONDS = 60  # API pages only add keywords, so those sweep at most this often
+
+# Shared pollinations.ai client: one pooled keep-alive session, a global
+# concurrency and rate limit, jittered exponential backoff and a circuit breaker
+LLM_BASE_URL = "https://text.pollinations.ai/"
+LLM_TIMEOUT_SECONDS = 30
+LLM_MAX_CONCURRENCY = 4
+LLM_RATE_PER_SECOND = 2.0
+LLM_BACKOFF_BASE_SECONDS = 1.0
+LLM_BACKOFF_MAX_SECONDS = 10.0
+LLM_BREAKER_THRESHOLD = 5
+LLM_BREAKER_COOLDOWN_SECONDS = 30
+llm_session = None  # Created on first use, see get_llm_session
+llm_semaphore = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+llm_lock = threading.Lock()
+llm_state = {"next_slot": 0.0, "consecutive_failures": 0, "open_until": 0.0}
+llm_metrics = {
+    "requests": 0, "successes": 0, "errors": 0, "retries": 0, "short_circuited": 0,
+    "latency_total_seconds": 0.0, "latency_max_seconds": 0.0,
+}
+
+# On-disk index of downloaded background images, keyed by normalised keyword,
+# so Bing is only searched for keywords we have never seen
+IMAGE_INDEX_PATH = output_dir / "index.json"
+IMAGE_STORE_MAX_BYTES = 500 * 1024 * 1024
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"}
+IMAGE_INDEX_SAVE_INTERVAL_SECONDS = 60  # Hits only refresh last_used, so they are written back at most this often
+image_index = None  # normalised keyword -> {"folder", "files", "last_used"}, loaded on first use
+image_index_saved_at = 0.0
+image_index_lock = threading.Lock()
+
+# Render assets: decoded fonts per thread, and backgrounds already scaled and
+# cropped to the card size, stored on disk by source file hash
+CARD_WIDTH, CARD_HEIGHT = 600, 1000
+FONT_PATH = "Muroslant.otf"
+FONT_SIZE = 36
+BACKGROUND_CACHE_VERSION = 1
+background_cache_dir = cache_dir / "backgrounds"
+# Matches pasting a 50% black overlay (v * (255 - 128) / 255 per channel) to within one level
+DARKEN_LUT = [v * 127 // 255 for v in range(256)] * 3
+RENDER_JPEG_QUALITY = 75
+RENDER_JPEG_PROGRESSIVE = False
+# Responsive copies of each reel card, encoded from the same in-memory canvas as
+# the JPEG and named reels/<hash>.<width>w.<ext>. Formats this Pillow build
+# cannot encode are skipped; smaller widths also get a JPEG for old browsers.
+REEL_VARIANT_WIDTHS = (300, 600)
+REEL_VARIANT_FORMATS = ("avif", "webp")
+VARIANT_SAVE_OPTIONS = {
+    "avif": {"quality": 55, "speed": 9},
+    "webp": {"quality": 70, "method": 2},
+    "jpeg": {"quality": RENDER_JPEG_QUALITY},
+}
+variant_formats = None  # REEL_VARIANT_FORMATS this Pillow supports, checked on first use
+source_hashes = {}  # (path, mtime, size) -> sha256 of the file
+render_assets = threading.local()
+
+# CPU-bound card rendering runs in worker processes so it is not bound by the GIL.
+# Submissions block once RENDER_QUEUE_LIMIT renders are queued or running.
+# RENDER_WORKERS = 0 renders on the calling thread instead.
+RENDER_WORKERS = os.cpu_count() or 1
+RENDER_QUEUE_LIMIT = RENDER_WORKERS * 4
+RENDER_QUEUE_TIMEOUT_SECONDS = 60
+render_pool = None
+render_pool_lock = threading.Lock()
+render_slots = threading.BoundedSemaphore(RENDER_QUEUE_LIMIT)
+
+# Text-to-speech runs on one long-lived event loop thread, with a cap on
+# concurrent edge-tts streams and a disk cache keyed by (text, voice)
+TTS_VOICE = "en-US-JennyNeural"  # You can change the voice here, see edge-tts --list-voices for options
+TTS_CONCURRENCY = 4
+audio_cache_dir = cache_dir / "audio"
+audio_loop = None
+audio_loop_lock = threading.Lock()
+audio_semaphore = None  # Created with the loop
+
+# Feed entries summarised per LLM request
+LLM_BATCH_SIZE = 5
+
+# Pipeline concurrency: shared worker threads plus a cap per pipeline stage
+PIPELINE_WORKERS = 8
+STAGE_LIMITS = {"llm": 3, "image": 2, "audio": 3}
+stage_semaphores = {stage: threading.BoundedSemaphore(limit) for stage, limit in STAGE_LIMITS.items()}
+pipeline_executor = ThreadPoolExecutor(max_workers=PIPELINE_WORKERS, thread_name_prefix="pipeline")
+
+# Single-flight: identical stage work already in progress (the same summary
+# cache key, or the same content-addressed reel file, which covers the entry
+# and RENDER_VERSION) is not started again; later callers wait for its result
+in_flight = {}  # (stage, key) -> Future of the leader's result
+in_flight_lock = threading.Lock()
+
+# Background generation jobs, so request handlers never wait on the pipeline.
+# Job records live in the state backend, so with the sqlite backend any worker
+# process can answer a poll for a job another one runs. Past MAX_ACTIVE_JOBS
+# queued or running jobs in this process, new ones are shed with a 503.
+JOB_WORKERS = 4
+MAX_ACTIVE_JOBS = JOB_WORKERS * 4
+BUSY_RETRY_AFTER_SECONDS = 5
+JOB_TTL_SECONDS = 600  # Records not updated for this long are forgotten
+job_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+active_jobs = {}  # job_id -> "queued" or "running", for the jobs this process runs
+jobs_lock = threading.Lock()
+
+# Async serving mode (python app.py --async): an aiohttp server whose event loop
+# runs generation jobs as coroutines, awaiting feed, LLM and TTS I/O directly.
+# Bing downloads, SQLite and manifest I/O go to the loop's blocking thread pool
+# and card rendering stays in the render processes, so one process can keep
+# hundreds of generations in flight. Other routes are served by Flask in threads.
+ASYNC_MAX_ACTIVE_JOBS = 1000
+ASYNC_STAGE_LIMITS = {"llm": 64, "image": 32, "audio": 64}
+ASYNC_LLM_CONCURRENCY = 32
+ASYNC_TTS_CONCURRENCY = 64
+ASYNC_HTTP_CONNECTIONS = 100
+ASYNC_BLOCKING_WORKERS = 32
+serving_loop = None  # Set once the async server's loop is running
+async_http = None  # aiohttp.ClientSession, created on the serving loop
+async_stage_semaphores = {}
+async_llm_semaphore = None
+async_render_semaphore = None  # RENDER_QUEUE_LIMIT, so renders wait on the loop rather than in blocking threads
+async_feed_locks = {}  # Only touched on the serving loop
+
+# JSON reel API: pages of REEL_PAGE_SIZE entries addressed by opaque cursors.
+# Serving a finished page starts generating the next one, so "Load More"
+# usually finds it ready.
+REEL_PAGE_SIZE = 3
+# Cursors name their feed by its selection ("all" or a 1-based rss_feeds index)
+# and are HMAC-signed, so a client can only page through the configured feeds
+# of a session it was given. CHRONICAL_SECRET_KEY sets the key; without it one
+# is generated into CURSOR_KEY_PATH and shared by every process on the host.
+CURSOR_SECRET_KEY = os.environ.get("CHRONICAL_SECRET_KEY")
+CURSOR_KEY_PATH = cache_dir / "cursor.key"
+CURSOR_SIGNATURE_BYTES = 16
+cursor_key = None  # Loaded by cursor_signing_key() on first use
+cursor_key_lock = threading.Lock()
+
+# Persistent cache of LLM summaries, keyed by entry content and prompt version.
+# Bump PROMPT_VERSION whenever build_summary_prompt changes.
+PROMPT_VERSION = 1
+SUMMARY_CACHE_PATH = cache_dir / "summaries.sqlite3"
+SUMMARY_CACHE_TTL_SECONDS = 7 * 24 * 3600
+SUMMARY_CACHE_MAX_ENTRIES = 5000
+summary_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+summary_cache_lock = threading.Lock()
+
+# Parsed feeds kept in memory per URL and refreshed with conditional GETs.
+# The background refresher runs more often than the freshness window, so
+# requests normally read straight from feed_cache. It only runs in long-running
+# servers: python app.py, CHRONICAL_PRELOAD=1 or CHRONICAL_FEED_REFRESHER=1;
+# a short-lived instance fetches feeds on demand instead.
+FEED_FRESHNESS_SECONDS = 300
+FEED_REFRESH_INTERVAL_SECONDS = 240
+FEED_REFRESHER = os.environ.get("CHRONICAL_FEED_REFRESHER", "1" if PRELOAD_DEPENDENCIES else "0") == "1"
+FEED_TIMEOUT_SECONDS = 30
+feed_cache = {}  # url -> {"entries", "etag", "modified", "fetched_at"}
+feed_cache_lock = threading.Lock()
+feed_fetch_locks = {}
+feed_refresher_started = False
+
+# Every entry a feed has published, stored by GUID/link with a per-feed sequence
+# number assigned on first sight. Sessions page through sequence numbers, so
+# items published between clicks never shift a page, and only unseen entries
+# are handed to the pipeline.
+ENTRY_INDEX_PATH = cache_dir / "entries.sqlite3"
+ENTRY_INDEX_MAX_PER_FEED = 500
+# A page stops at an entry whose summary request failed, so it is retried, but
+# only this many times; then it is skipped like an entry whose answer did not parse
+ENTRY_MAX_SUMMARY_FAILURES = 3
+
+# "All feeds": every configured feed fetched in parallel, merged newest first
+# and indexed under one pseudo-URL. Near-duplicate stories (MinHash over word
+# shingles of title and description) are collapsed before they are indexed,
+# so the same wire story from several outlets is summarised and rendered once.
+ALL_FEEDS_URL = "chronical:all-feeds"
+FEED_FETCH_WORKERS = 8
+feed_executor = ThreadPoolExecutor(max_workers=FEED_FETCH_WORKERS, thread_name_prefix="feed")
+SHINGLE_WORDS = 2
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16  # 4 rows per band: candidate pairs from about 0.5 similarity
+MINHASH_PRIME = (1 << 61) - 1
+NEAR_DUPLICATE_THRESHOLD = 0.5
+NEAR_DUPLICATE_WINDOW = 200  # Newest aggregated entries that new ones are compared against
+minhash_rng = random.Random(0)  # Fixed seed: signatures must agree across processes
+minhash_params = [(minhash_rng.randrange(1, MINHASH_PRIME), minhash_rng.randrange(MINHASH_PRIME)) for _ in range(MINHASH_PERMUTATIONS)]
+minhash_signatures = {}  # entry key -> signature, for entries in or near the window
+collapsed_entries = set()  # Keys of source entries already found to be near-duplicates
+
+# Finished reels live in static/images/reels/ under content-addressed names
+# (entry, summary, voice and RENDER_VERSION), listed by one manifest per feed.
+# A name never changes content, so /reels/ serves them as immutable.
+# Bump RENDER_VERSION whenever card or audio output changes.
+RENDER_VERSION = 2
+ASSET_MAX_AGE_SECONDS = 3 * 24 * 3600
+ASSET_GRACE_SECONDS = 3600
+ASSET_GC_INTERVAL_SECONDS = 3600
+REEL_CACHE_MAX_AGE_SECONDS = 365 * 24 * 3600
+reels_dir = Path("static/images/reels")
+manifest_dir = cache_dir / "manifests"
+manifest_lock = threading.Lock()
+last_garbage_collection = 0.0
+
+# Ahead-of-time reels written by the pre-generation worker (python app.py --pregenerate)
+PREGENERATE_ENTRIES = 6
+PREGENERATE_INTERVAL_SECONDS = 300
+
+
+# =============================================================================
+# Metrics
+# =============================================================================
+def observe_stage(stage, seconds):
+    """Add one stage duration to its histogram and to the current request or job breakdown"""
+    with metrics_lock:
+        histogram = stage_histograms.setdefault(stage, {"buckets": [0] * len(METRIC_BUCKETS), "sum": 0.0, "count": 0})
+        for i, bound in enumerate(METRIC_BUCKETS):
+            if seconds <= bound:
+                histogram["buckets"][i] += 1
+                break
+        histogram["sum"] += seconds
+        histogram["count"] += 1
+        timings = stage_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + seconds
+
+def count_event(event, **labels):
+    key = (event, tuple(sorted(labels.items())))
+    with metrics_lock:
+        event_counters[key] = event_counters.get(key, 0) + 1
+
+@contextmanager
+def stage_span(stage):
+    """Time a block as one pipeline stage, counting it as a failure if it raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        count_event("stage_failure", stage=stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        observe_stage(stage, elapsed)
+        logger.debug("⏱️ %s took %.3fs", stage, elapsed)
+
+def submit_traced(executor, func, *args):
+    """executor.submit that keeps the caller's timing breakdown in the worker thread"""
+    return executor.submit(contextvars.copy_context().run, func, *args)
+
+def format_server_timing(timings):
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in sorted(timings.items()))
+
+def prometheus_labels(labels):
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}" if labels else ""
+
+def render_prometheus_metrics():
+    lines = [
+        "# HELP chronical_stage_duration_seconds Time spent in each pipeline stage.",
+        "# TYPE chronical_stage_duration_seconds histogram",
+    ]
+    with metrics_lock:
+        histograms = {stage: dict(h, buckets=list(h["buckets"])) for stage, h in stage_histograms.items()}
+        events = dict(event_counters)
+    for stage, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(METRIC_BUCKETS, histogram["buckets"]):
+            cumulative += count
+            lines.append(f'chronical_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+        lines.append(f'chronical_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram["count"]}')
+        lines.append(f'chronical_stage_duration_seconds_sum{{stage="{stage}"}} {histogram["sum"]:.6f}')
+        lines.append(f'chronical_stage_duration_seconds_count{{stage="{stage}"}} {histogram["count"]}')
+
+    lines += ["# HELP chronical_events_total Cache hits, misses and stage failures.", "# TYPE chronical_events_total counter"]
+    for (event, labels), count in sorted(events.items()):
+        lines.append(f"chronical_events_total{prometheus_labels((('event', event),) + labels)} {count}")
+
+    llm = llm_metrics_snapshot()
+    for name in ("requests", "successes", "errors", "retries", "short_circuited"):
+        lines += [f"# TYPE chronical_llm_{name}_total counter", f"chronical_llm_{name}_total {llm[name]}"]
+    lines += ["# TYPE chronical_llm_circuit_open gauge", f"chronical_llm_circuit_open {int(llm['circuit_open'])}"]
+
+    with summary_cache_lock:
+        summary_cache = dict(summary_cache_stats)
+    for name, value in sorted(summary_cache.items()):
+        lines += [f"# TYPE chronical_summary_cache_{name}_total counter", f"chronical_summary_cache_{name}_total {value}"]
+    return "\n".join(lines) + "\n"
 
 
 # =============================================================================
 # New function: Use pollinations.ai API with the DeepSeek-R1 model
 # =============================================================================
+def reserve_llm_slot(earliest=0.0):
+    """Seconds to wait before sending: at least `earliest`, and 1/LLM_RATE_PER_SECOND after the previous request"""
+    with llm_lock:
+        now = time.monotonic()
+        slot = max(now + earliest, llm_state["next_slot"])
+        llm_state["next_slot"] = slot + 1.0 / LLM_RATE_PER_SECOND
+    return slot - now
+
+def llm_circuit_open():
+    with llm_lock:
+        return time.monotonic() < llm_state["open_until"]
+
+def record_llm_result(ok, latency):
+    """Update metrics and the circuit breaker after one request"""
+    with llm_lock:
+        llm_metrics["requests"] += 1
+        llm_metrics["latency_total_seconds"] += latency
+        llm_metrics["latency_max_seconds"] = max(llm_metrics["latency_max_seconds"], latency)
+        if ok:
+            llm_metrics["successes"] += 1
+            llm_state["consecutive_failures"] = 0
+            return
+        llm_metrics["errors"] += 1
+        llm_state["consecutive_failures"] += 1
+        if llm_state["consecutive_failures"] >= LLM_BREAKER_THRESHOLD:
+            llm_state["open_until"] = time.monotonic() + LLM_BREAKER_COOLDOWN_SECONDS
+            logger.warning("⛔ pollinations.ai failing, opening circuit for %ss", LLM_BREAKER_COOLDOWN_SECONDS)
+
+def llm_backoff_seconds(attempt):
+    """Full-jitter exponential backoff before retry number `attempt`"""
+    return random.uniform(0, min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+def llm_metrics_snapshot():
+    with llm_lock:
+        snapshot = dict(llm_metrics)
+        snapshot["circuit_open"] = time.monotonic() < llm_state["open_until"]
+    snapshot["latency_avg_seconds"] = snapshot["latency_total_seconds"] / snapshot["requests"] if snapshot["requests"] else 0.0
+    return snapshot
+
+def get_llm_session():
+    """The pooled keep-alive session for pollinations.ai, created on first use"""
+    global llm_session
+    with llm_lock:
+        if llm_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=LLM_MAX_CONCURRENCY))
+            session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=LLM_MAX_CONCURRENCY))
+            llm_session = session
+        return llm_session
+
+def begin_llm_attempt(attempt, max_retries):
+    """Seconds to wait before attempt number `attempt` (backoff, then the rate limit), or None while the circuit is open"""
+    if llm_circuit_open():
+        logger.warning("⛔ Circuit open, skipping pollinations.ai request")
+        with llm_lock:
+            llm_metrics["short_circuited"] += 1
+        return None
+    backoff = 0.0
+    if attempt:
+        with llm_lock:
+            llm_metrics["retries"] += 1
+        backoff = llm_backoff_seconds(attempt)
+    logger.debug("📤 Attempt %s/%s - Sending request to pollinations.ai...", attempt+1, max_retries)
+    return reserve_llm_slot(backoff)
+
+def finish_llm_attempt(started, status=None, text=None, error=None):
+    """Record one attempt's outcome for the breaker and metrics; the response text on a 200, else None"""
+    if status == 200:
+        record_llm_result(True, time.monotonic() - started)
+        logger.debug("✅ Received response from DeepSeek-R1: %s...", text[:200])
+        return text
+    if error is not None:
+        logger.warning("🔴 Exception during request: %s", error)
+    else:
+        logger.warning("❌ Error %s: Unable to fetch response", status)
+    record_llm_result(False, time.monotonic() - started)
+    return None
+
+def llm_request_url(prompt_text):
+    return f"{LLM_BASE_URL}{urllib.parse.quote(prompt_text)}"
+
 def get_deepseek_response(prompt_text, max_retries=3):
-    encoded_prompt = urllib.parse.quote(prompt_text)
-    request_url = f"https://text.pollinations.ai/{encoded_prompt}"
+    request_url = llm_request_url(prompt_text)
     for attempt in range(max_retries):
-        print(f"\n📤 Attempt {attempt+1}/{max_retries} - Sending request to pollinations.ai...")
+        delay = begin_llm_attempt(attempt, max_retries)
+        if delay is None:
+            return None
+        if delay > 0:
+            sleep(delay)
+        started = time.monotonic()
         try:
-            response = requests.get(request_url, timeout=30)
-            if response.status_code == 200:
-                print("✅ Received response from DeepSeek-R1:")
-                print(response.text[:200] + "...")
-                return response.text
-            else:
-                print(f"❌ Error {response.status_code}: Unable to fetch response")
+            with llm_semaphore, stage_span("llm_request"):
+                response = get_llm_session().get(request_url, timeout=LLM_TIMEOUT_SECONDS)
+            output = finish_llm_attempt(started, response.status_code, response.text)
         except Exception as e:
-            print(f"🔴 Exception during request: {e}")
-        sleep(2)
-    print("⏭️ Max retries reached. Giving up.")
+            output = finish_llm_attempt(started, error=e)
+        if output is not None:
+            return output
+    logger.warning("⏭️ Max retries reached. Giving up.")
     return None
 
 # =============================================================================
 # Image and Audio Processing Functions
 # =============================================================================
-def create_news_image(text, keyword, filename):
-    """Create an image with text overlay and proper image handling"""
-    print(f"\n🖼️ Creating image for keyword: {keyword}")
-    keyword = str(keyword).split(',')[0].strip()[:25]
-    keyword = ''.join(c for c in keyword if c.isalnum() or c in (' ', '-', '_'))
+def normalise_keyword(keyword):
+    return ' '.join(keyword.lower().split())
+
+def image_dhash(img):
+    """64-bit difference hash, as 16 hex digits"""
+    from PIL import Image
+    small = img.convert('L').resize((9, 8), Image.BILINEAR)
+    pixels = list(small.getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return f"{bits:016x}"
+
+def describe_image(path):
+    """Index metadata for one image file, or None if PIL cannot read it"""
+    from PIL import Image
+    try:
+        with Image.open(path) as img:
+            return {
+                "path": path.as_posix(),
+                "width": img.width,
+                "height": img.height,
+                "format": img.format,
+                "phash": image_dhash(img),
+                "bytes": path.stat().st_size,
+            }
+    except Exception:
+        return None
 
+def index_image_folder(folder):
+    """Describe every image in a keyword folder, deleting perceptual duplicates"""
+    files = []
+    seen_hashes = set()
+    for path in sorted(folder.iterdir()):
+        if path.suffix.lower() not in IMAGE_EXTENSIONS:
+            continue
+        info = describe_image(path)
+        if info is None:
+            continue
+        if info["phash"] in seen_hashes:
+            logger.info("🧹 Removing duplicate image: %s", path)
+            path.unlink()
+            continue
+        seen_hashes.add(info["phash"])
+        files.append(info)
+    return {"folder": folder.as_posix(), "files": files, "last_used": time.time()}
+
+def save_image_index():
+    """Write the image index (call with image_index_lock held); the temp name is unique per write, as other processes save it too"""
+    global image_index_saved_at
+    tmp_path = IMAGE_INDEX_PATH.with_suffix(f".{uuid.uuid4().hex}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(image_index, f)
+    os.replace(tmp_path, IMAGE_INDEX_PATH)
+    image_index_saved_at = time.time()
+
+def load_image_index():
+    """Load the image index, building it from the images/ folders the first time (call with image_index_lock held)"""
+    global image_index
+    if image_index is not None:
+        return image_index
     try:
-        print(f"🔍 Searching images for: {keyword}")
+        with open(IMAGE_INDEX_PATH) as f:
+            image_index = json.load(f)
+    except (OSError, ValueError):
+        logger.info("🗂️ Building image index...")
+        image_index = {}
+        for folder in sorted(p for p in output_dir.iterdir() if p.is_dir()):
+            entry = index_image_folder(folder)
+            if entry["files"]:
+                image_index[normalise_keyword(folder.name)] = entry
+        save_image_index()
+    return image_index
+
+def evict_image_store():
+    """Delete the least recently used keyword folders until the store fits IMAGE_STORE_MAX_BYTES (call with image_index_lock held)"""
+    total = sum(f["bytes"] for entry in image_index.values() for f in entry["files"])
+    for key in sorted(image_index, key=lambda k: image_index[k]["last_used"]):
+        if total <= IMAGE_STORE_MAX_BYTES:
+            break
+        entry = image_index.pop(key)
+        total -= sum(f["bytes"] for f in entry["files"])
+        logger.info("🧹 Evicting image folder: %s", entry['folder'])
+        shutil.rmtree(entry["folder"], ignore_errors=True)
+
+def fetch_keyword_images(keyword):
+    """Local image paths for a keyword, downloading from Bing only when the index has none"""
+    key = normalise_keyword(keyword)
+    with image_index_lock:
+        entry = load_image_index().get(key)
+        if entry:
+            paths = [Path(f["path"]) for f in entry["files"] if Path(f["path"]).exists()]
+            if paths:
+                logger.debug("🗂️ Image index hit for: %s", keyword)
+                count_event("image_index", result="hit")
+                entry["last_used"] = time.time()
+                if entry["last_used"] - image_index_saved_at >= IMAGE_INDEX_SAVE_INTERVAL_SECONDS:
+                    save_image_index()  # Otherwise the next save or eviction writes it
+                return paths
+
+    logger.debug("🔍 Searching images for: %s", keyword)
+    count_event("image_index", result="miss")
+    with stage_span("image_search"):
+        from bing_image_downloader import downloader
         downloader.download(
             f"{keyword}",
             limit=2,  # Download two images
@@ -79,232 +579,2129 @@ def create_news_image(text, keyword, filename):
             force_replace=False,
             timeout=30
         )
-        img_dir = output_dir / keyword
-        images = list(img_dir.glob('*'))
-        if images:
-            image_path = random.choice(images)
-            print(f"✅ Selected image at: {image_path}")
-            img = Image.open(image_path).convert('RGB')
-        else:
-            raise FileNotFoundError("No images downloaded")
-    except Exception as e:
-        print(f"🔴 Image download failed: {str(e)}")
-        print("⚠️ Using fallback background")
-        img = Image.new('RGB', (600, 1000), color=(255, 255, 255))
-
-    canvas_width, canvas_height = 600, 1000
-    canvas = Image.new('RGB', (canvas_width, canvas_height), color=(255, 255, 255))
-    img_ratio = img.width / img.height
-    new_height = 1000
-    new_width = int(img_ratio * new_height)
-    img = img.resize((new_width, new_height), Image.LANCZOS)
-
-    if new_width > canvas_width:
-        left = (new_width - canvas_width) // 2
-        right = left + canvas_width
-        img = img.crop((left, 0, right, new_height))
-    else:
-        paste_x = (canvas_width - new_width) // 2
-        paste_y = 0
-        canvas.paste(img, (paste_x, paste_y))
-        img = canvas
+    img_dir = output_dir / keyword
+    if not img_dir.is_dir():
+        return []
+
+    with image_index_lock:
+        entry = index_image_folder(img_dir)
+        if not entry["files"]:
+            return []
+        image_index[key] = entry
+        evict_image_store()
+        save_image_index()
+        return [Path(f["path"]) for f in entry["files"]]
+
+def load_font(path=FONT_PATH, size=FONT_SIZE):
+    """Decoded font, cached per thread since FreeType faces are not thread-safe"""
+    from PIL import ImageFont
+    fonts = getattr(render_assets, "fonts", None)
+    if fonts is None:
+        fonts = render_assets.fonts = {}
+    if (path, size) not in fonts:
+        try:
+            fonts[(path, size)] = ImageFont.truetype(path, size)
+        except OSError:
+            fonts[(path, size)] = ImageFont.load_default()
+    return fonts[(path, size)]
+
+def source_file_hash(path):
+    stat = path.stat()
+    memo_key = (str(path), stat.st_mtime_ns, stat.st_size)
+    if memo_key not in source_hashes:
+        source_hashes[memo_key] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return source_hashes[memo_key]
+
+def fit_background(img):
+    """Scale to the card height, then centre-crop wide images or centre them on white"""
+    from PIL import Image
+    new_width = max(1, int(img.width / img.height * CARD_HEIGHT))
+    # Cheap integer box reduction of very large sources before the LANCZOS pass
+    factor = img.height // (CARD_HEIGHT * 2)
+    if factor >= 2:
+        img = img.reduce(factor)
+    img = img.resize((new_width, CARD_HEIGHT), Image.LANCZOS)
 
-    if img.width == canvas_width:
-        canvas = img
+    if new_width > CARD_WIDTH:
+        left = (new_width - CARD_WIDTH) // 2
+        return img.crop((left, 0, left + CARD_WIDTH, CARD_HEIGHT))
+    canvas = Image.new('RGB', (CARD_WIDTH, CARD_HEIGHT), color=(255, 255, 255))
+    canvas.paste(img, ((CARD_WIDTH - new_width) // 2, 0))
+    return canvas
 
-    overlay = Image.new('RGBA', canvas.size, (0, 0, 0, 128))
-    canvas = canvas.convert('RGBA')
-    canvas.paste(overlay, (0, 0), overlay)
+def load_background(image_path):
+    """Card-sized RGB background for a source image, from the on-disk cache when possible"""
+    from PIL import Image
+    image_path = Path(image_path)
+    cached_path = background_cache_dir / f"{source_file_hash(image_path)}-{CARD_WIDTH}x{CARD_HEIGHT}-v{BACKGROUND_CACHE_VERSION}.jpg"
+    if cached_path.exists():
+        with Image.open(cached_path) as cached:
+            return cached.convert('RGB')
 
+    with Image.open(image_path) as img:
+        # JPEGs decode straight at a reduced DCT scale that is still at least card height
+        img.draft('RGB', (img.width * CARD_HEIGHT // img.height, CARD_HEIGHT))
+        background = fit_background(img.convert('RGB'))
+
+    tmp_path = cached_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+    background.save(tmp_path, format="JPEG", quality=95)
+    os.replace(tmp_path, cached_path)
+    return background
+
+def supported_variant_formats():
+    global variant_formats
+    if variant_formats is None:
+        from PIL import features
+        variant_formats = [fmt for fmt in REEL_VARIANT_FORMATS if features.check(fmt)]
+    return variant_formats
+
+def variant_filename(image_filename, width, fmt):
+    """reels/<hash>.jpg -> reels/<hash>.<width>w.<ext>"""
+    return f"{image_filename[:-len('.jpg')]}.{width}w.{'jpg' if fmt == 'jpeg' else fmt}"
+
+def save_atomic(img, output_path, **options):
+    """Save an image under a temporary name and move it into place, as copy_atomic does.
+
+    File-like outputs (such as the benchmarks' BytesIO) are written to directly.
+    """
+    if hasattr(output_path, "write"):
+        img.save(output_path, **options)
+        return
+    tmp_path = f"{output_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        img.save(tmp_path, **options)
+        os.replace(tmp_path, output_path)
+    finally:
+        Path(tmp_path).unlink(missing_ok=True)
+
+def save_variants(canvas, output_path):
+    """Write every responsive size and format of a finished card canvas"""
+    from PIL import Image
+    for width in REEL_VARIANT_WIDTHS:
+        size = (width, width * CARD_HEIGHT // CARD_WIDTH)
+        img = canvas if size == canvas.size else canvas.resize(size, Image.LANCZOS, reducing_gap=2.0)
+        formats = supported_variant_formats() + (["jpeg"] if width != CARD_WIDTH else [])
+        for fmt in formats:
+            save_atomic(img, variant_filename(str(output_path), width, fmt), format=fmt.upper(), **VARIANT_SAVE_OPTIONS[fmt])
+
+def render_card(text, background, output_path, quality=None, progressive=None, variants=False):
+    """Darken a card-sized background, centre the wrapped text on it and save it as JPEG.
+
+    With variants, the responsive copies are written first, so a reel whose JPEG
+    exists always has them.
+    """
+    from PIL import ImageDraw
+    canvas = background.point(DARKEN_LUT)
     draw = ImageDraw.Draw(canvas)
+    font = load_font()
+
+    lines = textwrap.wrap(text, width=35)
+    boxes = [font.getbbox(line) for line in lines]  # Measure each line once
+    text_height = sum(box[3] for box in boxes)
+    y = (CARD_HEIGHT - text_height) // 2
+    for line, box in zip(lines, boxes):
+        draw.text(((CARD_WIDTH - box[2]) // 2, y), line, font=font, fill="white")
+        y += box[3] + 5
+
+    if variants:
+        save_variants(canvas, output_path)
+    save_atomic(
+        canvas,
+        output_path,
+        format="JPEG",
+        quality=RENDER_JPEG_QUALITY if quality is None else quality,
+        progressive=RENDER_JPEG_PROGRESSIVE if progressive is None else progressive,
+    )
+
+def render_card_file(text, background_path, output_path, variants=False):
+    """Render job for the worker pool: background_path of None means a plain white card"""
+    from PIL import Image
+    if background_path is None:
+        background = Image.new('RGB', (CARD_WIDTH, CARD_HEIGHT), color=(255, 255, 255))
+    else:
+        background = load_background(background_path)
+    render_card(text, background, output_path, variants=variants)
+    return output_path
+
+def get_render_pool():
+    """The shared render process pool, or None when rendering in-thread"""
+    global render_pool, RENDER_WORKERS
+    with render_pool_lock:
+        if render_pool is None and RENDER_WORKERS > 0:
+            try:
+                # spawn, not fork: the web process is full of threads holding locks
+                render_pool = ProcessPoolExecutor(max_workers=RENDER_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+            except (OSError, NotImplementedError) as e:
+                logger.warning("⚠️ Render pool unavailable, rendering in-thread: %s", e)
+                RENDER_WORKERS = 0
+        return render_pool
+
+def submit_render(text, background_path, output_path, variants=False):
+    """Queue a render job and return its Future, waiting for a free slot when the queue is full"""
+    if not render_slots.acquire(timeout=RENDER_QUEUE_TIMEOUT_SECONDS):
+        raise RuntimeError("Render queue is full")
+
+    pool = get_render_pool()
+    if pool is None:
+        future = Future()
+        try:
+            future.set_result(render_card_file(text, background_path, output_path, variants))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            render_slots.release()
+        return future
+
+    try:
+        future = pool.submit(render_card_file, text, str(background_path) if background_path else None, output_path, variants)
+    except Exception:
+        render_slots.release()
+        raise
+    future.add_done_callback(lambda _: render_slots.release())
+    return future
+
+def clean_keyword(keyword):
+    """First keyword, trimmed to something safe as a search query and folder name"""
+    keyword = str(keyword).split(',')[0].strip()[:25]
+    return ''.join(c for c in keyword if c.isalnum() or c in (' ', '-', '_'))
+
+def pick_background(images):
+    if not images:
+        raise FileNotFoundError("No images downloaded")
+    image_path = random.choice(images)
+    logger.debug("✅ Selected image at: %s", image_path)
+    return image_path
+
+def fallback_background(error):
+    """None, meaning a plain card, after a failed image lookup"""
+    logger.warning("🔴 Image download failed: %s", error)
+    logger.warning("⚠️ Using fallback background")
+    return None
+
+def create_news_image(text, keyword, filename):
+    """Create an image with text overlay and proper image handling"""
+    logger.info("🖼️ Creating image for keyword: %s", keyword)
+    keyword = clean_keyword(keyword)
+
     try:
-        font = ImageFont.truetype("Muroslant.otf", 36)
-    except:
-        font = ImageFont.load_default()
-
-    wrapped_text = textwrap.wrap(text, width=35)
-    text_height = sum(draw.textbbox((0, 0), line, font=font)[3] for line in wrapped_text)
-    y = (canvas_height - text_height) // 2
-
-    for line in wrapped_text:
-        text_width = draw.textbbox((0, 0), line, font=font)[2]
-        x = (canvas_width - text_width) // 2
-        draw.text((x, y), line, font=font, fill="white")
-        y += draw.textbbox((0, 0), line, font=font)[3] + 5
-
-    canvas = canvas.convert('RGB')
-    canvas.save(f"static/images/{filename}")
-    print(f"✅ Saved image: static/images/{filename}")
-
-async def generate_speech(text, output_file):
-    """Generates speech using edge-tts and saves it to a file."""
+        image_path = pick_background(fetch_keyword_images(keyword))
+    except Exception as e:
+        image_path = fallback_background(e)
+
+    with stage_span("render"):
+        submit_render(text, image_path, f"static/images/{filename}", variants=True).result()
+    logger.debug("✅ Saved image: static/images/%s", filename)
+
+def audio_cache_path(text, voice):
+    digest = hashlib.sha256(f"{voice}\0{text}".encode("utf-8")).hexdigest()
+    return audio_cache_dir / f"{digest}.mp3"
+
+def copy_atomic(source, destination):
+    tmp_path = f"{destination}.{uuid.uuid4().hex}.tmp"
+    shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, destination)
+
+async def generate_speech(text, output_file, voice=TTS_VOICE):
+    """Generates speech using edge-tts and saves it to a file, reusing the (text, voice) cache.
+
+    Failures are logged and re-raised, so the reel is not served without audio.
+    """
     try:
-        voice = "en-US-JennyNeural"  # You can change the voice here, see edge-tts --list-voices for options
-        communicate = edge_tts.Communicate(text, voice)
-        with open(output_file, "wb") as f:
-            async for chunk in communicate.stream():
-                if chunk["type"] == "audio":
-                    f.write(chunk["data"])
-        print(f"✅ Saved audio: {output_file}")
+        cached_path = audio_cache_path(text, voice)
+        if cached_path.exists():
+            logger.debug("💾 Audio cache hit: %s", output_file)
+            count_event("audio_cache", result="hit")
+        else:
+            count_event("audio_cache", result="miss")
+            async with audio_semaphore:
+                import edge_tts
+                communicate = edge_tts.Communicate(text, voice)
+                tmp_path = cached_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+                try:
+                    with open(tmp_path, "wb") as f:
+                        async for chunk in communicate.stream():
+                            if chunk["type"] == "audio":
+                                f.write(chunk["data"])
+                    os.replace(tmp_path, cached_path)
+                finally:
+                    tmp_path.unlink(missing_ok=True)
+        copy_atomic(cached_path, output_file)
+        logger.debug("✅ Saved audio: %s", output_file)
     except Exception as e:
-        print(f"🔴 Audio generation failed: {e}")
+        logger.warning("🔴 Audio generation failed: %s", e)
+        raise
+
+def get_audio_loop():
+    """The long-lived event loop all speech synthesis runs on, started on first use"""
+    global audio_loop, audio_semaphore
+    with audio_loop_lock:
+        if audio_loop is None:
+            import asyncio
+            audio_semaphore = asyncio.Semaphore(TTS_CONCURRENCY)
+            audio_loop = asyncio.new_event_loop()
+            threading.Thread(target=audio_loop.run_forever, name="audio-loop", daemon=True).start()
+        return audio_loop
+
+def synthesise_speech(text, output_file, voice=TTS_VOICE):
+    """Schedule a clip on the audio loop and return a concurrent.futures.Future"""
+    import asyncio
+    return asyncio.run_coroutine_threadsafe(generate_speech(text, output_file, voice), get_audio_loop())
 
 def create_audio(text, filename):
     """Create an audio file from text using edge-tts"""
     output_file = f"static/images/{filename}.mp3"
-    asyncio.run(generate_speech(text, output_file))
+    synthesise_speech(text, output_file).result()
 
 
 # =============================================================================
-# RSS Processing Function
+# Session State
 # =============================================================================
-def process_rss_entries(rss_url, start_entry_index=0, num_entries=3):
-    """Enhanced RSS processing with better validation and pagination"""
-    print(f"\n📰 Processing RSS feed: {rss_url} from entry {start_entry_index}, count {num_entries}")
-    generated_files = []
-    processed_count = 0
-    try:
-        print("🔍 Fetching RSS entries...")
-        feed = feedparser.parse(rss_url)
+class MemoryStateBackend:
+    """Feed cursors and keyword sets held in this process only"""
+
+    def __init__(self, session_ttl=STATE_SESSION_TTL_SECONDS, job_ttl=JOB_TTL_SECONDS):
+        self.session_ttl = session_ttl
+        self.job_ttl = job_ttl
+        self._lock = threading.Lock()
+        self._cursors = {}  # (session_id, rss_url) -> (value, updated_at)
+        self._keywords = {}  # session_id -> {keyword: created_at}
+        self._jobs = {}  # job_id -> job record
+        self._pages = {}  # (session_id, rss_url, before_seq) -> job_id
+        self._next_expiry = 0.0
+
+    def get_cursor(self, session_id, rss_url):
+        with self._lock:
+            return self._cursors.get((session_id, rss_url), (0, None))[0]
+
+    def set_cursor(self, session_id, rss_url, value):
+        now = time.time()
+        with self._lock:
+            self._cursors[(session_id, rss_url)] = (value, now)
+            self._expire(now)
+
+    def add_keyword(self, session_id, keyword):
+        """Record a keyword for a session; False if the session already had it"""
+        now = time.time()
+        with self._lock:
+            if now >= self._next_expiry:
+                self._expire(now)
+            keywords = self._keywords.setdefault(session_id, {})
+            if keyword in keywords:
+                return False
+            keywords[keyword] = now
+            return True
+
+    def _expire(self, now):
+        """Forget cursors and keywords older than session_ttl, as SQLiteStateBackend does"""
+        cutoff = now - self.session_ttl
+        self._cursors = {key: entry for key, entry in self._cursors.items() if entry[1] >= cutoff}
+        for session_id, keywords in list(self._keywords.items()):
+            kept = {keyword: created_at for keyword, created_at in keywords.items() if created_at >= cutoff}
+            if kept:
+                self._keywords[session_id] = kept
+            else:
+                del self._keywords[session_id]
+        self._next_expiry = now + STATE_EXPIRY_INTERVAL_SECONDS
+
+    def create_job(self, job_id, job):
+        with self._lock:
+            self._expire_jobs(job["updated_at"])
+            self._jobs[job_id] = dict(job, reels=list(job["reels"]))
+
+    def get_job(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job, reels=list(job["reels"])) if job else None
+
+    def update_job(self, job_id, fields):
+        with self._lock:
+            if job_id in self._jobs:  # Gone if it expired while running
+                self._jobs[job_id].update(fields, updated_at=time.time())
+
+    def add_job_reel(self, job_id, reel):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id]["reels"].append(dict(reel))
+                self._jobs[job_id]["updated_at"] = time.time()
+
+    def page_job(self, page):
+        """Job id of a (session_id, rss_url, before_seq) page that is queued, running or done, else None"""
+        with self._lock:
+            return self._live_page_job(page)
+
+    def claim_page(self, page, job_id, job):
+        """Create job as the page's job unless it already has a live one; returns the page's job id"""
+        with self._lock:
+            existing = self._live_page_job(page)
+            if existing is not None:
+                return existing
+            self._expire_jobs(job["updated_at"])
+            self._jobs[job_id] = dict(job, reels=list(job["reels"]))
+            self._pages[page] = job_id
+            return job_id
+
+    def drop_page(self, page):
+        with self._lock:
+            self._pages.pop(page, None)
+
+    def _live_page_job(self, page):
+        job_id = self._pages.get(page)
+        job = self._jobs.get(job_id)
+        return job_id if job and job["status"] != "failed" else None
+
+    def _expire_jobs(self, now):
+        cutoff = now - self.job_ttl
+        self._jobs = {job_id: job for job_id, job in self._jobs.items() if job["updated_at"] >= cutoff}
+        self._pages = {page: job_id for page, job_id in self._pages.items() if job_id in self._jobs}
+
+
+class SQLiteStateBackend:
+    """Feed cursors, keyword sets and job records in one SQLite file shared by every worker process"""
+
+    def __init__(self, path, session_ttl=STATE_SESSION_TTL_SECONDS, job_ttl=JOB_TTL_SECONDS):
+        self.path = path
+        self.session_ttl = session_ttl
+        self.job_ttl = job_ttl
+        self._next_expiry = 0.0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cursors ("
+                "session_id TEXT NOT NULL, rss_url TEXT NOT NULL, value INTEGER NOT NULL, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (session_id, rss_url))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS keywords ("
+                "session_id TEXT NOT NULL, keyword TEXT NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (session_id, keyword))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id TEXT PRIMARY KEY, status TEXT NOT NULL, record TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "session_id TEXT NOT NULL, rss_url TEXT NOT NULL, before_seq INTEGER NOT NULL, job_id TEXT NOT NULL, "
+                "PRIMARY KEY (session_id, rss_url, before_seq))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS pages_job_id ON pages (job_id)")
+
+    def _connect(self, immediate=True):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return _Transaction(conn, immediate)
+
+    def get_cursor(self, session_id, rss_url):
+        with self._connect(immediate=False) as conn:
+            row = conn.execute("SELECT value FROM cursors WHERE session_id = ? AND rss_url = ?", (session_id, rss_url)).fetchone()
+            return row[0] if row else 0
+
+    def set_cursor(self, session_id, rss_url, value):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO cursors (session_id, rss_url, value, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (session_id, rss_url) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                (session_id, rss_url, value, now),
+            )
+            # Every stored-cursor page passes through here, so this is also where abandoned sessions are expired
+            self._expire(conn, now)
+
+    def add_keyword(self, session_id, keyword):
+        """Record a keyword for a session; False if the session already had it"""
+        now = time.time()
+        with self._connect() as conn:
+            if now >= self._next_expiry:
+                self._expire(conn, now)
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO keywords (session_id, keyword, created_at) VALUES (?, ?, ?)",
+                (session_id, keyword, now),
+            )
+            return cursor.rowcount == 1
+
+    def _expire(self, conn, now):
+        conn.execute("DELETE FROM cursors WHERE updated_at < ?", (now - self.session_ttl,))
+        conn.execute("DELETE FROM keywords WHERE created_at < ?", (now - self.session_ttl,))
+        self._next_expiry = now + STATE_EXPIRY_INTERVAL_SECONDS
+
+    def create_job(self, job_id, job):
+        with self._connect() as conn:
+            self._insert_job(conn, job_id, job)
+
+    def get_job(self, job_id):
+        with self._connect(immediate=False) as conn:
+            return self._read_job(conn, job_id)
+
+    def update_job(self, job_id, fields):
+        with self._connect() as conn:
+            job = self._read_job(conn, job_id)
+            if job is not None:  # Gone if it expired while running
+                job.update(fields)
+                self._write_job(conn, job_id, job)
+
+    def add_job_reel(self, job_id, reel):
+        with self._connect() as conn:
+            job = self._read_job(conn, job_id)
+            if job is not None:
+                job["reels"].append(reel)
+                self._write_job(conn, job_id, job)
+
+    def page_job(self, page):
+        """Job id of a (session_id, rss_url, before_seq) page that is queued, running or done, else None"""
+        with self._connect(immediate=False) as conn:
+            return self._live_page_job(conn, page)
+
+    def claim_page(self, page, job_id, job):
+        """Create job as the page's job unless it already has a live one; returns the page's job id"""
+        with self._connect() as conn:
+            existing = self._live_page_job(conn, page)
+            if existing is not None:
+                return existing
+            self._insert_job(conn, job_id, job)
+            conn.execute(
+                "INSERT OR REPLACE INTO pages (session_id, rss_url, before_seq, job_id) VALUES (?, ?, ?, ?)",
+                (*page, job_id),
+            )
+            return job_id
+
+    def drop_page(self, page):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM pages WHERE session_id = ? AND rss_url = ? AND before_seq = ?", page)
+
+    def _live_page_job(self, conn, page):
+        row = conn.execute(
+            "SELECT job_id FROM pages JOIN jobs USING (job_id) "
+            "WHERE session_id = ? AND rss_url = ? AND before_seq = ? AND status != 'failed'",
+            page,
+        ).fetchone()
+        return row[0] if row else None
+
+    def _read_job(self, conn, job_id):
+        row = conn.execute("SELECT record FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _write_job(self, conn, job_id, job):
+        job["updated_at"] = time.time()
+        conn.execute(
+            "UPDATE jobs SET status = ?, record = ?, updated_at = ? WHERE job_id = ?",
+            (job["status"], json.dumps(job), job["updated_at"], job_id),
+        )
+
+    def _insert_job(self, conn, job_id, job):
+        # Jobs are created far less often than they are polled, so expired ones are dropped here
+        cutoff = job["updated_at"] - self.job_ttl
+        conn.execute("DELETE FROM pages WHERE job_id IN (SELECT job_id FROM jobs WHERE updated_at < ?)", (cutoff,))
+        conn.execute("DELETE FROM jobs WHERE updated_at < ?", (cutoff,))
+        conn.execute(
+            "INSERT INTO jobs (job_id, status, record, updated_at) VALUES (?, ?, ?, ?)",
+            (job_id, job["status"], json.dumps(job), job["updated_at"]),
+        )
+
+
+class _Transaction:
+    """Run a block in one transaction and close the connection afterwards.
+
+    Blocks that write take the write lock up front (BEGIN IMMEDIATE), so a
+    read-modify-write cannot be overtaken; read-only blocks pass
+    immediate=False and read a WAL snapshot without waiting for writers.
+    """
+
+    def __init__(self, conn, immediate=True):
+        self.conn = conn
+        self.immediate = immediate
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE" if self.immediate else "BEGIN")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.conn.close()
+
+
+def make_state_backend(name=STATE_BACKEND):
+    if name == "memory":
+        return MemoryStateBackend()
+    if name == "sqlite":
+        return SQLiteStateBackend(STATE_DB_PATH)
+    raise ValueError(f"Unknown state backend: {name}")
+
+
+state = None  # Set up by create_app()
+
+
+# =============================================================================
+# Summary Cache
+# =============================================================================
+def summary_cache_key(title, description):
+    """Content hash of a feed entry for the current prompt version"""
+    payload = f"{PROMPT_VERSION}\0{title}\0{description}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+def open_summary_cache():
+    conn = sqlite3.connect(SUMMARY_CACHE_PATH, timeout=10)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS summaries ("
+        "key TEXT PRIMARY KEY, text TEXT NOT NULL, keyword TEXT NOT NULL, "
+        "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+    )
+    return conn
+
+def get_cached_summary(key):
+    """Return the cached {text, keyword} for key, or None on a miss or expired entry"""
+    now = time.time()
+    with summary_cache_lock:
+        conn = open_summary_cache()
+        try:
+            row = conn.execute("SELECT text, keyword, created_at FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row and now - row[2] <= SUMMARY_CACHE_TTL_SECONDS:
+                conn.execute("UPDATE summaries SET last_used = ? WHERE key = ?", (now, key))
+                conn.commit()
+                summary_cache_stats["hits"] += 1
+                return {"text": row[0], "keyword": row[1]}
+            if row:
+                conn.execute("DELETE FROM summaries WHERE key = ?", (key,))
+                conn.commit()
+                summary_cache_stats["evictions"] += 1
+            summary_cache_stats["misses"] += 1
+            return None
+        finally:
+            conn.close()
+
+def store_cached_summary(key, result):
+    """Save a summary, then evict expired rows and the least recently used overflow"""
+    now = time.time()
+    with summary_cache_lock:
+        conn = open_summary_cache()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, text, keyword, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, result["text"], result["keyword"], now, now),
+            )
+            expired = conn.execute("DELETE FROM summaries WHERE created_at < ?", (now - SUMMARY_CACHE_TTL_SECONDS,)).rowcount
+            overflow = conn.execute(
+                "DELETE FROM summaries WHERE key IN ("
+                "SELECT key FROM summaries ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (SUMMARY_CACHE_MAX_ENTRIES,),
+            ).rowcount
+            conn.commit()
+            summary_cache_stats["evictions"] += expired + overflow
+        finally:
+            conn.close()
+
+
+# =============================================================================
+# Feed Fetching
+# =============================================================================
+def feed_request_headers(cached):
+    """Conditional GET headers from the last fetch, so an unchanged feed costs a 304"""
+    headers = {}
+    if cached and cached["etag"]:
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached["modified"]:
+        headers["If-Modified-Since"] = cached["modified"]
+    return headers
+
+def store_feed_response(rss_url, cached, status, headers, body):
+    """Parse and index one feed download, or keep the cached copy on a 304, and return the entries"""
+    now = time.time()
+    if cached and status == 304:
+        logger.debug("♻️ Feed not modified: %s", rss_url)
+        count_event("feed_fetch", result="not_modified")
+        entry = dict(cached, fetched_at=now)
+    elif status >= 400:
+        raise ValueError(f"RSS fetch error: HTTP {status}")
+    else:
+        import feedparser
+        headers = {name.lower(): value for name, value in headers.items()}  # As feedparser expects
+        feed = feedparser.parse(body, response_headers=headers)
         if feed.bozo:
-            print(f"🔴 RSS parsing error: {feed.bozo_exception}")
-            return generated_files, processed_count
+            raise ValueError(f"RSS parsing error: {feed.bozo_exception}")
+        entry = {
+            "entries": feed.entries,
+            "etag": headers.get("etag"),
+            "modified": headers.get("last-modified"),
+            "fetched_at": now,
+        }
+        ingest_entries(rss_url, feed.entries)
+
+    with feed_cache_lock:
+        feed_cache[rss_url] = entry
+    return entry["entries"]
+
+def fetch_feed(rss_url):
+    """Download and parse a feed with a conditional GET"""
+    import requests
+    with feed_cache_lock:
+        cached = feed_cache.get(rss_url)
+
+    with stage_span("feed_fetch"):
+        response = requests.get(rss_url, headers=feed_request_headers(cached), timeout=FEED_TIMEOUT_SECONDS)
+    return store_feed_response(rss_url, cached, response.status_code, response.headers, response.content)
+
+def feed_fetch_lock(rss_url):
+    with feed_cache_lock:
+        return feed_fetch_locks.setdefault(rss_url, threading.Lock())
 
-        entries = feed.entries
-        total_entries = len(entries)
-        print(f"✅ Found {total_entries} total entries")
+def fresh_feed_entries(rss_url):
+    """Cached entries of a feed if fetched within FEED_FRESHNESS_SECONDS, else None"""
+    with feed_cache_lock:
+        cached = feed_cache.get(rss_url)
+        if cached and time.time() - cached["fetched_at"] < FEED_FRESHNESS_SECONDS:
+            return cached["entries"]
+    return None
+
+def get_feed_entries(rss_url):
+    """Parsed entries of a feed, fetched only when the cached copy is older than FEED_FRESHNESS_SECONDS"""
+    if rss_url == ALL_FEEDS_URL:
+        return get_aggregated_entries()
+    entries = fresh_feed_entries(rss_url)
+    if entries is not None:
+        return entries
+
+    with feed_fetch_lock(rss_url):
+        # Another thread may have refreshed the feed while we waited
+        entries = fresh_feed_entries(rss_url)
+        if entries is not None:
+            return entries
+        return fetch_feed(rss_url)
+
+def refresh_feeds_forever():
+    while True:
+        for feed in rss_feeds:
+            try:
+                with feed_fetch_lock(feed["url"]):
+                    fetch_feed(feed["url"])
+            except Exception as e:
+                logger.warning("🔴 Feed refresh failed for %s: %s", feed['url'], e)
+        sleep(FEED_REFRESH_INTERVAL_SECONDS)
+
+def start_feed_refresher():
+    """Start the background feed refresher once per process"""
+    global feed_refresher_started
+    with feed_cache_lock:
+        if feed_refresher_started:
+            return
+        feed_refresher_started = True
+    threading.Thread(target=refresh_feeds_forever, name="feed-refresher", daemon=True).start()
+
+
+# =============================================================================
+# Feed Aggregation
+# =============================================================================
+def entry_timestamp(entry):
+    published = entry.get('published_parsed') or entry.get('updated_parsed')
+    return calendar.timegm(published) if published else 0
+
+def minhash_signature(text):
+    """MinHash of the word shingles of text, comparable across processes"""
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    shingles = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(max(1, len(words) - SHINGLE_WORDS + 1))}
+    hashes = [int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big") for shingle in shingles]
+    return tuple(min((a * h + b) % MINHASH_PRIME for h in hashes) for a, b in minhash_params)
+
+def minhash_bands(signature):
+    rows = MINHASH_PERMUTATIONS // MINHASH_BANDS
+    return [(band, signature[band * rows:(band + 1) * rows]) for band in range(MINHASH_BANDS)]
 
-        if start_entry_index >= total_entries:
-            print("⏭️ No more entries to process.")
-            return generated_files, processed_count
+def collapse_near_duplicates(items, known):
+    """Drop items whose estimated Jaccard similarity to an earlier item, or to a known one, reaches the threshold.
 
+    items are (key, text, entry) newest first; known maps key -> signature of
+    entries already indexed. Returns the entries kept, in order.
+    """
+    buckets = {}
+    signatures = dict(known)
+    for key, signature in known.items():
+        for band in minhash_bands(signature):
+            buckets.setdefault(band, []).append(key)
 
-        end_entry_index = min(start_entry_index + num_entries, total_entries)
-        entries_to_process = entries[start_entry_index:end_entry_index]
+    kept = []
+    for key, text, entry in items:
+        if key not in minhash_signatures:
+            minhash_signatures[key] = minhash_signature(text)
+        signature = signatures[key] = minhash_signatures[key]
+        candidates = {other for band in minhash_bands(signature) for other in buckets.get(band, ())}
+        duplicate = next((other for other in candidates
+                          if sum(x == y for x, y in zip(signature, signatures[other])) >= NEAR_DUPLICATE_THRESHOLD * MINHASH_PERMUTATIONS), None)
+        if duplicate:
+            logger.debug("🧬 Collapsing near-duplicate: %s", text[:50])
+            count_event("aggregate_entry", result="collapsed")
+            continue
+        for band in minhash_bands(signature):
+            buckets.setdefault(band, []).append(key)
+        kept.append(entry)
+    return kept
 
-        print(f"Processing entries {start_entry_index + 1} to {end_entry_index} ({len(entries_to_process)} entries)")
+def selected_feed_url(selection):
+    """Feed URL for a form/query feed choice: "all", or a 1-based index into rss_feeds"""
+    if selection == "all":
+        return ALL_FEEDS_URL
+    index = int(selection)
+    if index < 1:
+        raise IndexError(f"No feed {index}")
+    return rss_feeds[index - 1]['url']
 
+def feed_selection(rss_url):
+    """The selection naming rss_url for selected_feed_url, or None if it is not a configured feed"""
+    if rss_url == ALL_FEEDS_URL:
+        return "all"
+    for i, feed in enumerate(rss_feeds, start=1):
+        if feed['url'] == rss_url:
+            return str(i)
+    return None
 
-        file_index_start = start_entry_index + 1 # Filename index start
-        for i, entry in enumerate(entries_to_process):
-            current_file_index = file_index_start + i
+def get_aggregated_entries():
+    """Fetch every configured feed in parallel, merge newest first and index the new, distinct entries"""
+    futures = [submit_traced(feed_executor, get_feed_entries, feed["url"]) for feed in rss_feeds]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(e)
+    return index_aggregated_entries(results)
 
-            print(f"\n📄 Processing entry {current_file_index}/{total_entries}")
-            title = entry.get('title', '').strip()
-            description = entry.get('description', '').strip()
+def index_aggregated_entries(results):
+    """Merge every source feed's entries (or fetch error, in rss_feeds order) newest first and index the new, distinct ones under ALL_FEEDS_URL"""
+    merged = []
+    for feed, entries in zip(rss_feeds, results):
+        if isinstance(entries, Exception):
+            logger.warning("🔴 Feed fetch failed for %s: %s", feed["url"], entries)
+        else:
+            merged.extend(entries)
+    merged.sort(key=entry_timestamp, reverse=True)  # Stable, so undated entries keep feed order
 
-            if not title and not description:
-                print("⏭️ Skipping empty entry")
+    with feed_fetch_lock(ALL_FEEDS_URL), stage_span("aggregate"):
+        known_keys = indexed_keys(ALL_FEEDS_URL)
+        window = entry_page(ALL_FEEDS_URL, limit=NEAR_DUPLICATE_WINDOW)
+        known = {}
+        for _, key, title, description in window:
+            if key not in minhash_signatures:
+                minhash_signatures[key] = minhash_signature(f"{title} {description}")
+            known[key] = minhash_signatures[key]
+
+        items = []
+        seen = known_keys | collapsed_entries
+        for entry in merged:
+            key = entry_key(entry)
+            text = f"{entry.get('title', '').strip()} {entry.get('description', '').strip()}".strip()
+            if key in seen or not text:
                 continue
+            seen.add(key)
+            items.append((key, text, entry))
+        kept = collapse_near_duplicates(items, known)
+        ingest_entries(ALL_FEEDS_URL, kept)
+        kept_ids = {id(entry) for entry in kept}
+        collapsed_entries.update(key for key, _, entry in items if id(entry) not in kept_ids)
 
-            print(f"📝 Title: {title[:50]}...")
-            print(f"📝 Description: {description[:50]}...")
+        # Keep signatures only for the window, and collapse records for entries still in the source feeds
+        current = set(known) | {key for key, _, _ in items}
+        for key in [key for key in minhash_signatures if key not in current]:
+            del minhash_signatures[key]
+        collapsed_entries.intersection_update({entry_key(entry) for entry in merged})
+    return merged
 
 
-            prompt = (
-                "Generate valid JSON with two keys:\n"
-                "- \"text\": A short, one-line summary (plain text).\n"
-                "- \"keyword\": A single term (maximum two words) related to the text, including a person's name if mentioned.\n\n"
-                "News:\n"
-                f"Title: {title}\n"
-                f"Description: {description}\n\n"
-                "JSON:"
+# =============================================================================
+# Entry Index
+# =============================================================================
+def open_entry_index(immediate=True):
+    conn = sqlite3.connect(ENTRY_INDEX_PATH, timeout=10, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS entries ("
+        "rss_url TEXT NOT NULL, key TEXT NOT NULL, seq INTEGER NOT NULL, "
+        "title TEXT NOT NULL, description TEXT NOT NULL, first_seen REAL NOT NULL, "
+        "PRIMARY KEY (rss_url, key))"
+    )
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS entries_by_seq ON entries (rss_url, seq)")
+    if "summary_failures" not in {row[1] for row in conn.execute("PRAGMA table_info(entries)")}:
+        try:
+            conn.execute("ALTER TABLE entries ADD COLUMN summary_failures INTEGER NOT NULL DEFAULT 0")
+        except sqlite3.OperationalError:
+            pass  # Another process added it first
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS feeds ("
+        "rss_url TEXT PRIMARY KEY, high_water INTEGER NOT NULL, updated_at REAL NOT NULL)"
+    )
+    return _Transaction(conn, immediate)
+
+def ingest_entries(rss_url, entries):
+    """Add entries not seen before to the index, oldest first, and return how many were new"""
+    items = []
+    for entry in entries:
+        title = entry.get('title', '').strip()
+        description = entry.get('description', '').strip()
+        if title or description:
+            items.append((entry_key(entry), title, description))
+
+    now = time.time()
+    with open_entry_index() as conn:
+        row = conn.execute("SELECT high_water FROM feeds WHERE rss_url = ?", (rss_url,)).fetchone()
+        high_water = row[0] if row else 0
+        known = {key for (key,) in conn.execute("SELECT key FROM entries WHERE rss_url = ?", (rss_url,))}
+        new_items = []
+        for key, title, description in items:
+            if key not in known:
+                known.add(key)
+                new_items.append((key, title, description))
+        # Feeds list newest first; number the new entries so newer ones sort higher
+        for key, title, description in reversed(new_items):
+            high_water += 1
+            conn.execute(
+                "INSERT INTO entries (rss_url, key, seq, title, description, first_seen) VALUES (?, ?, ?, ?, ?, ?)",
+                (rss_url, key, high_water, title, description, now),
             )
+        conn.execute(
+            "INSERT INTO feeds (rss_url, high_water, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (rss_url) DO UPDATE SET high_water = excluded.high_water, updated_at = excluded.updated_at",
+            (rss_url, high_water, now),
+        )
+        conn.execute("DELETE FROM entries WHERE rss_url = ? AND seq <= ?", (rss_url, high_water - ENTRY_INDEX_MAX_PER_FEED))
+    if new_items:
+        logger.info("🆕 %s new entries indexed for %s", len(new_items), rss_url)
+    count_event("entry_index", result="new" if new_items else "unchanged")
+    return len(new_items)
+
+def entry_page(rss_url, before_seq=0, limit=3):
+    """Up to `limit` indexed entries older than before_seq (0 = newest), newest first, as (seq, key, title, description)"""
+    with open_entry_index(immediate=False) as conn:
+        if before_seq:
+            query = "SELECT seq, key, title, description FROM entries WHERE rss_url = ? AND seq < ? ORDER BY seq DESC LIMIT ?"
+            return conn.execute(query, (rss_url, before_seq, limit)).fetchall()
+        query = "SELECT seq, key, title, description FROM entries WHERE rss_url = ? ORDER BY seq DESC LIMIT ?"
+        return conn.execute(query, (rss_url, limit)).fetchall()
+
+def indexed_keys(rss_url):
+    with open_entry_index(immediate=False) as conn:
+        return {key for (key,) in conn.execute("SELECT key FROM entries WHERE rss_url = ?", (rss_url,))}
 
-            output = get_deepseek_response(prompt)
-            if not output:
+def record_summary_failure(rss_url, key):
+    """Count a failed summary request for an indexed entry and return its failures so far"""
+    with open_entry_index() as conn:
+        row = conn.execute(
+            "UPDATE entries SET summary_failures = summary_failures + 1 WHERE rss_url = ? AND key = ? RETURNING summary_failures",
+            (rss_url, key),
+        ).fetchone()
+    return row[0] if row else ENTRY_MAX_SUMMARY_FAILURES
+
+
+# =============================================================================
+# Pipeline Stages
+# =============================================================================
+def run_stage(stage, func, *args):
+    """Run one pipeline stage call while holding that stage's concurrency slot"""
+    with stage_semaphores[stage], stage_span(stage):
+        return func(*args)
+
+def claim_flight(flight):
+    """(future, leader) for a (stage, key); the leader must call finish_flight, others wait on the future"""
+    with in_flight_lock:
+        future = in_flight.get(flight)
+        if future is not None:
+            count_event("single_flight", stage=flight[0], result="shared")
+            return future, False
+        future = in_flight[flight] = Future()
+        return future, True
+
+def finish_flight(flight, result=None, error=None):
+    with in_flight_lock:
+        future = in_flight.pop(flight)
+    if error is None:
+        future.set_result(result)
+    else:
+        future.set_exception(error)
+
+def single_flight(flight, func, *args):
+    """func(*args), unless the same (stage, key) is already running, in which case share that result"""
+    future, leader = claim_flight(flight)
+    if not leader:
+        return future.result()
+    try:
+        result = func(*args)
+    except Exception as e:
+        finish_flight(flight, error=e)
+        raise
+    finish_flight(flight, result)
+    return result
+
+def build_summary_prompt(title, description):
+    return (
+        "Generate valid JSON with two keys:\n"
+        "- \"text\": A short, one-line summary (plain text).\n"
+        "- \"keyword\": A single term (maximum two words) related to the text, including a person's name if mentioned.\n\n"
+        "News:\n"
+        f"Title: {title}\n"
+        f"Description: {description}\n\n"
+        "JSON:"
+    )
+
+# An entry's summary when the LLM answered but nothing usable parsed: unlike
+# None (the request failed or the circuit was open), asking again will not help
+NO_SUMMARY = "no-summary"
+
+def parse_summary_response(output):
+    """Extract the {text, keyword} object from an LLM response"""
+    json_start = output.find('{')
+    json_end = output.rfind('}') + 1
+    result = json.loads(output[json_start:json_end])
+    if not all(k in result for k in ['text', 'keyword']):
+        raise ValueError("Missing required fields")
+    return result
+
+def build_batch_summary_prompt(items):
+    """One prompt covering several (title, description) pairs"""
+    news = "".join(
+        f"News {i}:\nTitle: {title}\nDescription: {description}\n\n"
+        for i, (title, description) in enumerate(items, start=1)
+    )
+    return (
+        f"Generate a valid JSON array with exactly {len(items)} objects, one per news item below, in the same order. Each object has three keys:\n"
+        "- \"id\": The number of the news item.\n"
+        "- \"text\": A short, one-line summary (plain text).\n"
+        "- \"keyword\": A single term (maximum two words) related to the text, including a person's name if mentioned.\n\n"
+        f"{news}"
+        "JSON:"
+    )
+
+def parse_batch_summary_response(output, count):
+    """Parse each object of a batched response on its own; slots that fail stay None.
+
+    Objects are placed by their "id"; array order is only trusted for objects
+    without one when the response has exactly `count` objects, since a skipped
+    item would otherwise shift every later summary onto the wrong entry.
+    """
+    results = [None] * count
+    objects = []
+    decoder = json.JSONDecoder()
+    pos = output.find('{')
+    while pos != -1:
+        try:
+            obj, end = decoder.raw_decode(output, pos)
+        except ValueError:
+            pos = output.find('{', pos + 1)
+            continue
+        if isinstance(obj, dict):
+            objects.append(obj)
+        pos = output.find('{', end)
+
+    in_order = len(objects) == count
+    for position, obj in enumerate(objects):
+        if not (isinstance(obj.get('text'), str) and isinstance(obj.get('keyword'), str)):
+            continue
+        slot = obj.get('id')
+        if not (isinstance(slot, int) and 1 <= slot <= count):
+            if not in_order:
                 continue
+            slot = position + 1  # Fall back to array order
+        if results[slot - 1] is None:
+            results[slot - 1] = {'text': obj['text'], 'keyword': obj['keyword']}
+    return results
 
-            try:
-                print("🔨 Parsing response...")
-                json_start = output.find('{')
-                json_end = output.rfind('}') + 1
-                json_content = output[json_start:json_end]
-                result = json.loads(json_content)
-                print("✅ Parsed JSON:", result)
+def accept_summary(title, description, output):
+    """Parse and cache one entry's LLM output; None if there is none, NO_SUMMARY if it does not parse"""
+    if not output:
+        return None
+
+    try:
+        logger.debug("🔨 Parsing response...")
+        result = parse_summary_response(output)
+        logger.debug("✅ Parsed JSON: %s", result)
+        store_cached_summary(summary_cache_key(title, description), result)
+        return result
+    except json.JSONDecodeError:
+        logger.warning("🔴 Invalid JSON: %s", output)
+    except Exception as e:
+        logger.warning("🔴 Processing error: %s", e)
+    return NO_SUMMARY
+
+def accept_summary_batch(items, output):
+    """Parse and cache a batched LLM response; items it did not cover stay None, to be retried one by one"""
+    results = parse_batch_summary_response(output, len(items))
+    logger.debug("✅ Batch of %s parsed %s summaries", len(items), sum(r is not None for r in results))
+    for (title, description), result in zip(items, results):
+        if result is None:
+            logger.warning("↩️ Falling back to a single request for: %s", title[:50])
+        else:
+            store_cached_summary(summary_cache_key(title, description), result)
+    return results
+
+def request_summary(title, description):
+    """Ask the LLM to summarise one entry and cache the result; None or NO_SUMMARY on failure, see accept_summary"""
+    return accept_summary(title, description, run_stage("llm", get_deepseek_response, build_summary_prompt(title, description)))
+
+def request_summary_batch(items):
+    """Summarise several entries with one LLM call, retrying unparsed items one by one.
+
+    If the batch request itself fails, every item is None: single requests
+    would only add load to an LLM that is already failing.
+    """
+    if len(items) == 1:
+        return [request_summary(*items[0])]
+
+    output = run_stage("llm", get_deepseek_response, build_batch_summary_prompt(items))
+    if output is None:
+        return [None] * len(items)
+    results = accept_summary_batch(items, output)
+    for i, (title, description) in enumerate(items):
+        if results[i] is None:
+            results[i] = request_summary(title, description)
+    return results
+
+def claim_summaries(items):
+    """Look items up in the summary cache and claim the misses no other caller is summarising.
+
+    Returns (keys, results, batches, shared, pending): results holds the cache
+    hits, batches groups the claimed indexes LLM_BATCH_SIZE per request, shared
+    maps indexes claimed elsewhere to their futures, and pending is the set of
+    claimed indexes still to finish or release.
+    """
+    keys = [summary_cache_key(title, description) for title, description in items]
+    results = [get_cached_summary(key) for key in keys]
+    misses = [i for i, result in enumerate(results) if result is None]
+    logger.debug("💾 Summary cache: %s hits, %s misses", len(items) - len(misses), len(misses))
+
+    owned = []
+    shared = {}
+    for i in misses:
+        future, leader = claim_flight(("llm", keys[i]))
+        if leader:
+            owned.append(i)
+        else:
+            shared[i] = future
+    batches = [owned[i:i + LLM_BATCH_SIZE] for i in range(0, len(owned), LLM_BATCH_SIZE)]
+    return keys, results, batches, shared, set(owned)
+
+def finish_summary_batch(keys, results, pending, batch, summaries):
+    """Store one batch's summaries and hand them to the callers waiting on them"""
+    for i, summary in zip(batch, summaries):
+        results[i] = summary
+        pending.discard(i)
+        finish_flight(("llm", keys[i]), summary)
+
+def release_summary_flights(keys, pending):
+    for i in pending:  # Failed batches: waiting callers get no summary, as we do
+        finish_flight(("llm", keys[i]))
+
+def summarise_entries(items):
+    """Summarise (title, description) pairs, batching cache misses LLM_BATCH_SIZE per request.
+
+    Entries another caller is already summarising are not requested again; their
+    results are shared once that caller's batch finishes.
+    """
+    keys, results, batches, shared, pending = claim_summaries(items)
+    try:
+        batch_futures = [submit_traced(pipeline_executor, request_summary_batch, [items[i] for i in batch]) for batch in batches]
+        for batch, future in zip(batches, batch_futures):
+            finish_summary_batch(keys, results, pending, batch, future.result())
+    finally:
+        release_summary_flights(keys, pending)
+    for i, future in shared.items():
+        results[i] = future.result()
+    return results
+
+
+# =============================================================================
+# RSS Processing Function
+# =============================================================================
+class ReelProgress:
+    """Counts the finished image and audio parts of a page's reels, reporting each reel once both succeed"""
+
+    def __init__(self, reels, on_reel=None):
+        self.remaining = {image_filename: 2 for image_filename, _, _ in reels}
+        self.failed = set()
+        self.on_reel = on_reel
+
+    def part_done(self, image_filename, error=None):
+        if error is not None:
+            logger.warning("🔴 Processing error: %s", error)
+            self.failed.add(image_filename)
+        self.remaining[image_filename] -= 1
+        if self.remaining[image_filename] == 0 and image_filename not in self.failed and self.on_reel:
+            self.on_reel(image_filename)
+
+    def rendered(self):
+        """Image filenames whose image and audio both succeeded, in input order"""
+        return [f for f in self.remaining if f not in self.failed]
+
+
+def reel_parts(reels):
+    """(image_filename, flight, stage, args) for the image and the audio of every reel"""
+    for image_filename, audio_filename, result in reels:
+        yield image_filename, ("image", image_filename), "image", (result['text'], result['keyword'], image_filename)
+        yield image_filename, ("audio", audio_filename), "audio", (result['text'], audio_filename)
+
+def render_reels(reels, on_reel=None):
+    """Render the image and audio of every (image_filename, audio_filename, summary) concurrently.
+
+    Returns the image filenames whose image and audio both succeeded, in input order.
+    on_reel, if given, is called with each image filename as soon as it is ready.
+    """
+    stage_funcs = {"image": create_news_image, "audio": create_audio}
+    progress = ReelProgress(reels, on_reel)
+    part_futures = {
+        submit_traced(pipeline_executor, single_flight, flight, run_stage, stage, stage_funcs[stage], *args): image_filename
+        for image_filename, flight, stage, args in reel_parts(reels)
+    }
+    for future in as_completed(part_futures):
+        progress.part_done(part_futures[future], future.exception())
+    return progress.rendered()
+
+def plan_page(rss_url, before_seq, num_entries):
+    """Stage 0: the page's (key, title, description) entries and their sequence numbers.
+
+    Also returns a summary slot per entry, pre-filled from the manifest for
+    entries with a finished reel, and the indexes of the entries still to summarise.
+    """
+    page = entry_page(rss_url, before_seq, num_entries)
+    if not page:
+        return [], [], [], []
+    logger.debug("Processing entries #%s to #%s (%s entries)", page[0][0], page[-1][0], len(page))
+
+    manifest = load_feed_manifest(rss_url)
+    pending = []
+    for seq, key, title, description in page:
+        logger.debug("📄 Queueing entry #%s", seq)
+        logger.debug("📝 Title: %s...", title[:50])
+        logger.debug("📝 Description: %s...", description[:50])
+        pending.append((key, title, description))
+    seqs = [seq for seq, _, _, _ in page]
 
-                if not all(k in result for k in ['text', 'keyword']):
-                    raise ValueError("Missing required fields")
+    summaries = [None] * len(pending)
+    to_summarise = []
+    for i, (key, _, _) in enumerate(pending):
+        reel = manifest.get(key)
+        if reel and reel_assets_exist(reel["image"]):
+            summaries[i] = reel
+        else:
+            to_summarise.append(i)
+    return pending, seqs, summaries, to_summarise
+
+def settle_page(rss_url, before_seq, pending, seqs, summaries):
+    """Cut the page at its newest entry whose summary request failed, and return (pending, summaries, next_seq).
+
+    The cursor stops just before that entry, so it and everything after it is
+    retried on the next page; with the first entry failed, next_seq is before_seq.
+    After ENTRY_MAX_SUMMARY_FAILURES such failures the entry is skipped instead,
+    as entries whose summary did not parse (NO_SUMMARY) always are.
+    """
+    for i, summary in enumerate(summaries):
+        if summary is not None:
+            continue
+        failures = record_summary_failure(rss_url, pending[i][0])
+        if failures < ENTRY_MAX_SUMMARY_FAILURES:
+            logger.warning("⏸️ No summary for entry #%s (failure %s); the page stops there so it is retried", seqs[i], failures)
+            return pending[:i], summaries[:i], seqs[i - 1] if i else before_seq
+        logger.warning("⏭️ Skipping entry #%s after %s failed summaries", seqs[i], failures)
+        summaries[i] = NO_SUMMARY
+    return pending, summaries, seqs[-1]
+
+def select_reels(pending, summaries, session_id):
+    """Stage 2: drop repeated keywords in entry order, so the output stays deterministic.
+
+    Returns (generated_files, ready, reels, served): every reel filename in entry
+    order, those already on disk, (image_filename, audio_filename, summary) for
+    those still to render, and the manifest records for all of them.
+    """
+    generated_files = []
+    ready = []
+    reels = []
+    served = {}
+    for (key, _, _), result in zip(pending, summaries):
+        if not isinstance(result, dict):
+            continue
+        keyword = result['keyword']
+        if session_id and not state.add_keyword(session_id, keyword):
+            logger.info("🔁 Keyword '%s' already processed. Skipping to avoid repetition.", keyword)
+            continue
+        logger.debug("📋 Summary: %s", result['text'])
+        logger.debug("🔑 Keyword: %s", keyword)
+        image_filename = reel_filename(key, result)  # Differs from the manifest's after a RENDER_VERSION bump
+        served[key] = {"image": image_filename, "text": result['text'], "keyword": keyword}
+        generated_files.append(image_filename)
+        if reel_assets_exist(image_filename):
+            logger.debug("⚡ Reusing finished reel: %s", image_filename)
+            ready.append(image_filename)
+        else:
+            reels.append((image_filename, image_filename[:-len(".jpg")], result))
+    return generated_files, ready, reels, served
+
+def reel_callback(on_reel, served):
+    """Adapt on_reel to the render stage, which reports image filenames: it gets that reel's record from served"""
+    if on_reel is None:
+        return None
+    by_image = {reel["image"]: reel for reel in served.values()}
+    return lambda image_filename: on_reel(by_image[image_filename])
+
+def finish_page(rss_url, generated_files, ready, rendered, served):
+    """Record the page's finished reels in the feed manifest and return their filenames"""
+    generated_files = [f for f in generated_files if f in ready or f in rendered]
+    update_feed_manifest(rss_url, {key: reel for key, reel in served.items() if reel["image"] in generated_files})
+    return generated_files
+
+def process_rss_entries(rss_url, before_seq=0, num_entries=3, on_reel=None, session_id=None):
+    """Enhanced RSS processing with better validation and pagination.
+
+    Processes the next num_entries indexed entries older than before_seq
+    (0 = start from the newest) and returns (generated_files, processed_count,
+    next_seq); pass next_seq back in to fetch the following page. A page stops
+    at the first entry whose summary request failed, so next_seq does not skip
+    it until it has failed ENTRY_MAX_SUMMARY_FAILURES times (see settle_page).
+
+    on_reel, if given, is called with each reel's {"image", "text", "keyword"}
+    record as soon as its image and audio are both written, in completion order. With a session_id,
+    keywords that session has already seen are skipped.
+    """
+    logger.info("📰 Processing RSS feed: %s before entry #%s, count %s", rss_url, before_seq or "newest", num_entries)
+    generated_files = []
+    processed_count = 0
+    next_seq = before_seq
+    try:
+        logger.debug("🔍 Fetching RSS entries...")
+        get_feed_entries(rss_url)  # Refreshes the entry index when the cached feed is stale
+        pending, seqs, summaries, to_summarise = plan_page(rss_url, before_seq, num_entries)
+        if not pending:
+            logger.info("⏭️ No more entries to process.")
+            return generated_files, processed_count, next_seq
+
+        # Stage 1: summarise every entry without a finished reel, in batches
+        for i, summary in zip(to_summarise, summarise_entries([pending[i][1:] for i in to_summarise])):
+            summaries[i] = summary
+        pending, summaries, next_seq = settle_page(rss_url, before_seq, pending, seqs, summaries)
+
+        generated_files, ready, reels, served = select_reels(pending, summaries, session_id)
+        on_rendered = reel_callback(on_reel, served)
+        if on_rendered:
+            for image_filename in ready:
+                on_rendered(image_filename)
+
+        # Stage 3: render the image and audio of every remaining reel concurrently
+        rendered = set(render_reels(reels, on_reel=on_rendered))
+        generated_files = finish_page(rss_url, generated_files, ready, rendered, served)
+        processed_count = len(generated_files)
+
+    except Exception as e:
+        logger.error("🔴 RSS processing failed: %s", e)
+        next_seq = before_seq  # Retry the whole page next time
+
+    return generated_files, processed_count, next_seq
+
+# =============================================================================
+# Asset Store
+# =============================================================================
+def entry_key(entry):
+    """Stable identity of a feed entry: its GUID, else its link, else its text"""
+    identity = entry.get('id') or entry.get('link') or (entry.get('title', '') + entry.get('description', ''))
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()[:32]
+
+def feed_slug(rss_url):
+    return hashlib.sha256(rss_url.encode("utf-8")).hexdigest()[:12]
+
+def reel_filename(key, summary):
+    """Content-addressed image filename (relative to static/images) for an entry's summary"""
+    payload = f"{key}\0{summary['text']}\0{summary['keyword']}\0{TTS_VOICE}\0{RENDER_VERSION}".encode("utf-8")
+    return f"reels/{hashlib.sha256(payload).hexdigest()[:32]}.jpg"
 
-                keyword = result['keyword']
-                if keyword in processed_keywords:
-                    print(f"🔁 Keyword '{keyword}' already processed. Skipping to avoid repetition.")
-                    continue
+def reel_assets_exist(image_filename):
+    image_path = Path("static/images") / image_filename
+    return image_path.exists() and image_path.with_suffix(".mp3").exists()
 
-                processed_keywords.add(keyword)
-                print(f"📋 Summary: {result['text']}")
-                print(f"🔑 Keyword: {keyword}")
+def feed_manifest_path(rss_url):
+    return manifest_dir / f"{feed_slug(rss_url)}.json"
 
-                image_filename = f"news_summary_{current_file_index}.jpg"
-                audio_filename = f"news_summary_{current_file_index}"
+def read_manifest(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_manifest(path, manifest):
+    tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
 
-                create_news_image(result['text'], keyword, image_filename)
-                create_audio(result['text'], audio_filename)
+def load_feed_manifest(rss_url):
+    """Map of entry key -> {image, text, keyword, created_at, last_used} for a feed's finished reels"""
+    return read_manifest(feed_manifest_path(rss_url))
 
-                generated_files.append(image_filename)
-                processed_count += 1
+def update_feed_manifest(rss_url, reels, keep_keys=None):
+    """Record reels as used now; with keep_keys, also forget entries no longer in the feed"""
+    now = time.time()
+    path = feed_manifest_path(rss_url)
+    with manifest_lock:
+        manifest = read_manifest(path)
+        if keep_keys is not None:
+            manifest = {key: reel for key, reel in manifest.items() if key in keep_keys}
+        for key, reel in reels.items():
+            created_at = manifest.get(key, {}).get("created_at", now)
+            manifest[key] = dict(reel, created_at=created_at, last_used=now)
+        write_manifest(path, manifest)
 
+def collect_garbage():
+    """Forget reels unused for ASSET_MAX_AGE_SECONDS, then delete files no manifest references"""
+    now = time.time()
+    referenced = set()
+    with manifest_lock:
+        for path in manifest_dir.glob("*.json"):
+            manifest = read_manifest(path)
+            kept = {key: reel for key, reel in manifest.items() if now - reel["last_used"] < ASSET_MAX_AGE_SECONDS}
+            if len(kept) != len(manifest):
+                write_manifest(path, kept)
+            referenced.update(Path(reel["image"]).stem for reel in kept.values())
 
-            except json.JSONDecodeError:
-                print(f"🔴 Invalid JSON: {output}")
+    removed = 0
+    for path in reels_dir.iterdir():
+        # The grace period covers reels still rendering, which no manifest lists yet
+        if path.name.split('.')[0] not in referenced and now - path.stat().st_mtime > ASSET_GRACE_SECONDS:
+            path.unlink(missing_ok=True)
+            removed += 1
+    logger.info("🧹 Garbage collection removed %s reel files", removed)
+
+def maybe_collect_garbage():
+    """Run collect_garbage at most once per ASSET_GC_INTERVAL_SECONDS per process"""
+    global last_garbage_collection
+    with manifest_lock:
+        if time.time() - last_garbage_collection < ASSET_GC_INTERVAL_SECONDS:
+            return
+        last_garbage_collection = time.time()
+    try:
+        collect_garbage()
+    except Exception as e:
+        logger.warning("🔴 Garbage collection failed: %s", e)
+
+# =============================================================================
+# Pre-generation Worker
+# =============================================================================
+def pregenerate_feed(rss_url, limit=PREGENERATE_ENTRIES):
+    """Keep the newest `limit` indexed entries of a feed rendered, and forget entries the index has dropped"""
+    logger.info("🏭 Pre-generating feed: %s", rss_url)
+    get_feed_entries(rss_url)
+    manifest = load_feed_manifest(rss_url)
+    newest = [(key, title, description) for _, key, title, description in entry_page(rss_url, limit=limit)]
+
+    missing = [item for item in newest if item[0] not in manifest or not reel_assets_exist(reel_filename(item[0], manifest[item[0]]))]
+    summaries = summarise_entries([item[1:] for item in missing])
+
+    reels = []
+    keys = {}
+    for (key, _, _), result in zip(missing, summaries):
+        if isinstance(result, dict):
+            image_filename = reel_filename(key, result)
+            keys[image_filename] = key
+            reels.append((image_filename, image_filename[:-len(".jpg")], result))
+    rendered = set(render_reels(reels))
+
+    # Touch every current reel so garbage collection keeps the newest entries warm
+    finished = {key: manifest[key] for key, _, _ in newest if key in manifest}
+    for image_filename, _, result in reels:
+        if image_filename in rendered:
+            finished[keys[image_filename]] = {"image": image_filename, "text": result["text"], "keyword": result["keyword"]}
+    update_feed_manifest(rss_url, finished, keep_keys=indexed_keys(rss_url))
+    logger.info("✅ %s new reels, %s pre-generated for %s", len(rendered), len(finished), rss_url)
+
+def run_pregeneration_worker():
+    """Worker mode: keep every configured feed, and the all-feeds view, pre-rendered, forever"""
+    while True:
+        for rss_url in [feed["url"] for feed in rss_feeds] + [ALL_FEEDS_URL]:
+            try:
+                pregenerate_feed(rss_url)
             except Exception as e:
-                print(f"🔴 Processing error: {str(e)}")
+                logger.warning("🔴 Pre-generation failed for %s: %s", rss_url, e)
+        maybe_collect_garbage()
+        sleep(PREGENERATE_INTERVAL_SECONDS)
+
+# =============================================================================
+# Async Pipeline
+# =============================================================================
+async def run_stage_async(stage, func, *args):
+    """Await one pipeline stage coroutine while holding that stage's slot on the serving loop"""
+    async with async_stage_semaphores[stage]:
+        with stage_span(stage):
+            return await func(*args)
+
+async def async_single_flight(flight, func, *args):
+    """Await func(*args), unless the same (stage, key) is already running, in which case share that result"""
+    import asyncio
+    future, leader = claim_flight(flight)
+    if not leader:
+        return await asyncio.wrap_future(future)
+    try:
+        result = await func(*args)
+    except BaseException as e:  # Cancellation too, so waiters are not left hanging
+        finish_flight(flight, error=e)
+        raise
+    finish_flight(flight, result)
+    return result
+
+async def get_llm_response_async(prompt_text, max_retries=3):
+    """get_deepseek_response on the serving loop: same rate limit, breaker and metrics"""
+    import asyncio
+    import aiohttp
+    from yarl import URL
+    request_url = URL(llm_request_url(prompt_text), encoded=True)
+    for attempt in range(max_retries):
+        delay = begin_llm_attempt(attempt, max_retries)
+        if delay is None:
+            return None
+        if delay > 0:
+            await asyncio.sleep(delay)
+        started = time.monotonic()
+        try:
+            async with async_llm_semaphore:
+                with stage_span("llm_request"):
+                    async with async_http.get(request_url, timeout=aiohttp.ClientTimeout(total=LLM_TIMEOUT_SECONDS)) as response:
+                        text = await response.text()
+            output = finish_llm_attempt(started, response.status, text)
+        except Exception as e:
+            output = finish_llm_attempt(started, error=e)
+        if output is not None:
+            return output
+    logger.warning("⏭️ Max retries reached. Giving up.")
+    return None
+
+async def fetch_feed_async(rss_url):
+    """fetch_feed with the download awaited on the serving loop and parsing in the blocking pool"""
+    import asyncio
+    import aiohttp
+    with feed_cache_lock:
+        cached = feed_cache.get(rss_url)
+
+    with stage_span("feed_fetch"):
+        timeout = aiohttp.ClientTimeout(total=FEED_TIMEOUT_SECONDS)
+        async with async_http.get(rss_url, headers=feed_request_headers(cached), timeout=timeout) as response:
+            body = await response.read()
+    return await asyncio.to_thread(store_feed_response, rss_url, cached, response.status, response.headers, body)
+
+async def get_feed_entries_async(rss_url):
+    """get_feed_entries on the serving loop; "All feeds" fetches its sources concurrently"""
+    import asyncio
+    if rss_url == ALL_FEEDS_URL:
+        results = await asyncio.gather(*(get_feed_entries_async(feed["url"]) for feed in rss_feeds), return_exceptions=True)
+        return await asyncio.to_thread(index_aggregated_entries, results)
+    entries = fresh_feed_entries(rss_url)
+    if entries is not None:
+        return entries
+
+    async with async_feed_locks.setdefault(rss_url, asyncio.Lock()):
+        # Another job may have refreshed the feed while we waited
+        entries = fresh_feed_entries(rss_url)
+        if entries is not None:
+            return entries
+        return await fetch_feed_async(rss_url)
+
+async def request_summary_async(title, description):
+    import asyncio
+    output = await run_stage_async("llm", get_llm_response_async, build_summary_prompt(title, description))
+    return await asyncio.to_thread(accept_summary, title, description, output)
+
+async def request_summary_batch_async(items):
+    import asyncio
+    if len(items) == 1:
+        return [await request_summary_async(*items[0])]
+
+    output = await run_stage_async("llm", get_llm_response_async, build_batch_summary_prompt(items))
+    if output is None:
+        return [None] * len(items)
+    results = await asyncio.to_thread(accept_summary_batch, items, output)
+    for i, (title, description) in enumerate(items):
+        if results[i] is None:
+            results[i] = await request_summary_async(title, description)
+    return results
+
+async def summarise_entries_async(items):
+    """summarise_entries on the serving loop, sharing in-flight summaries with threads and other jobs"""
+    import asyncio
+    keys, results, batches, shared, pending = await asyncio.to_thread(claim_summaries, items)
+    try:
+        batch_results = await asyncio.gather(*(request_summary_batch_async([items[i] for i in batch]) for batch in batches))
+        for batch, summaries in zip(batches, batch_results):
+            finish_summary_batch(keys, results, pending, batch, summaries)
+    finally:
+        release_summary_flights(keys, pending)
+    for i, future in shared.items():
+        results[i] = await asyncio.wrap_future(future)
+    return results
+
+async def create_news_image_async(text, keyword, filename):
+    """create_news_image with the Bing download in the blocking pool and the render awaited"""
+    import asyncio
+    logger.info("🖼️ Creating image for keyword: %s", keyword)
+    keyword = clean_keyword(keyword)
+
+    try:
+        # Hundreds of jobs can miss on the same keyword at once here, so one download serves them all
+        images = await async_single_flight(("image_search", normalise_keyword(keyword)), asyncio.to_thread, fetch_keyword_images, keyword)
+        image_path = pick_background(images)
+    except Exception as e:
+        image_path = fallback_background(e)
+
+    with stage_span("render"):
+        # Holding a loop slot means render_slots has room, so submit_render only ever waits for
+        # the render pool to start, not for the queue, and never holds a blocking-pool thread long
+        async with async_render_semaphore:
+            render = await asyncio.to_thread(submit_render, text, image_path, f"static/images/{filename}", True)
+            await asyncio.wrap_future(render)
+    logger.debug("✅ Saved image: static/images/%s", filename)
+
+async def create_audio_async(text, filename):
+    """Synthesise a reel's audio directly on the serving loop, which is also the audio loop"""
+    await generate_speech(text, f"static/images/{filename}.mp3")
+
+async def render_reels_async(reels, on_reel=None):
+    """render_reels on the serving loop: every image and audio of the page awaited concurrently"""
+    import asyncio
+    stage_funcs = {"image": create_news_image_async, "audio": create_audio_async}
+
+    async def render_part(image_filename, flight, stage, args):
+        try:
+            await async_single_flight(flight, run_stage_async, stage, stage_funcs[stage], *args)
+            return image_filename, None
+        except Exception as e:
+            return image_filename, e
+
+    progress = ReelProgress(reels, on_reel)
+    for part in asyncio.as_completed([render_part(*part) for part in reel_parts(reels)]):
+        progress.part_done(*await part)
+    return progress.rendered()
+
+async def process_rss_entries_async(rss_url, before_seq=0, num_entries=3, on_reel=None, session_id=None):
+    """process_rss_entries as a coroutine on the serving loop; same arguments and return value"""
+    import asyncio
+    logger.info("📰 Processing RSS feed: %s before entry #%s, count %s", rss_url, before_seq or "newest", num_entries)
+    generated_files = []
+    processed_count = 0
+    next_seq = before_seq
+    try:
+        logger.debug("🔍 Fetching RSS entries...")
+        await get_feed_entries_async(rss_url)
+        pending, seqs, summaries, to_summarise = await asyncio.to_thread(plan_page, rss_url, before_seq, num_entries)
+        if not pending:
+            logger.info("⏭️ No more entries to process.")
+            return generated_files, processed_count, next_seq
+
+        for i, summary in zip(to_summarise, await summarise_entries_async([pending[i][1:] for i in to_summarise])):
+            summaries[i] = summary
+        pending, summaries, next_seq = await asyncio.to_thread(settle_page, rss_url, before_seq, pending, seqs, summaries)
+
+        generated_files, ready, reels, served = await asyncio.to_thread(select_reels, pending, summaries, session_id)
+        on_rendered = reel_callback(on_reel, served)
+        if on_rendered:
+            for image_filename in ready:
+                on_rendered(image_filename)
+
+        rendered = set(await render_reels_async(reels, on_reel=on_rendered))
+        generated_files = await asyncio.to_thread(finish_page, rss_url, generated_files, ready, rendered, served)
+        processed_count = len(generated_files)
 
     except Exception as e:
-        print(f"🔴 RSS processing failed: {str(e)}")
+        logger.error("🔴 RSS processing failed: %s", e)
+        next_seq = before_seq  # Retry the whole page next time
+
+    return generated_files, processed_count, next_seq
 
-    return generated_files, processed_count
+async def run_job_async(job_id, session_id, rss_url, num_entries, before_seq=None):
+    """run_job as a task on the serving loop; job records are written from the blocking pool"""
+    import asyncio
+    timings = start_job_timings()  # Each task runs in its own copy of the context
+    reel_writes = []
+    try:
+        await asyncio.to_thread(start_job, job_id)
+        with stage_span("job"):
+            page = await process_rss_entries_async(
+                rss_url,
+                before_seq=await asyncio.to_thread(job_start_seq, session_id, rss_url, before_seq),
+                num_entries=num_entries,
+                on_reel=lambda reel: reel_writes.append(asyncio.ensure_future(asyncio.to_thread(add_job_reel, job_id, reel))),
+                session_id=session_id,
+            )
+        await asyncio.gather(*reel_writes)  # Every reel is recorded before the job is done
+        await asyncio.to_thread(finish_job, job_id, session_id, rss_url, before_seq, page, timings)
+    except Exception as e:
+        await asyncio.gather(*reel_writes, return_exceptions=True)
+        await asyncio.to_thread(fail_job, job_id, e, timings)
+    await asyncio.to_thread(maybe_collect_garbage)
+
+# =============================================================================
+# Background Jobs
+# =============================================================================
+class ServerBusy(Exception):
+    """Raised by submit_job when MAX_ACTIVE_JOBS (ASYNC_MAX_ACTIVE_JOBS when serving async) generations are queued or running in this process"""
+
+def new_job(rss_url):
+    """A queued job's record, as kept in the state backend"""
+    return {
+        "status": "queued",
+        "rss_url": rss_url,
+        "reels": [],  # {"image", "text", "keyword"}, appended as each reel finishes
+        "processed_count": None,
+        "next_seq": None,  # Cursor for the following page, set when the job ends
+        "error": None,
+        "timings": {},  # Seconds per pipeline stage, filled in when the job ends
+        "updated_at": time.time(),
+    }
+
+def reserve_job(job_id, limit):
+    """Count a job against this process's limit of queued and running jobs, or raise ServerBusy"""
+    with jobs_lock:
+        if len(active_jobs) >= limit:
+            count_event("load_shed")
+            raise ServerBusy(f"{len(active_jobs)} generations already queued or running")
+        active_jobs[job_id] = "queued"
+
+def release_job(job_id):
+    with jobs_lock:
+        active_jobs.pop(job_id, None)
+
+def update_job(job_id, **fields):
+    state.update_job(job_id, fields)
+
+def add_job_reel(job_id, reel):
+    """Record a finished reel's {"image", "text", "keyword"} on its job"""
+    state.add_job_reel(job_id, dict(reel))
+
+def start_job(job_id):
+    """Mark a job running"""
+    with jobs_lock:
+        active_jobs[job_id] = "running"
+    update_job(job_id, status="running")
+
+def start_job_timings():
+    """Start a job's timing breakdown in the current context"""
+    timings = {}
+    stage_timings.set(timings)
+    return timings
+
+def job_start_seq(session_id, rss_url, before_seq):
+    """The page a job generates: before_seq, or with None the page after the session's stored cursor"""
+    return state.get_cursor(session_id, rss_url) if before_seq is None else before_seq
+
+def finish_job(job_id, session_id, rss_url, before_seq, page, timings):
+    """Record a finished job's (generated_files, processed_count, next_seq), advancing the session cursor if it owns it"""
+    _, processed_count, next_seq = page
+    if before_seq is None:
+        state.set_cursor(session_id, rss_url, next_seq)
+    update_job(job_id, status="done", processed_count=processed_count, next_seq=next_seq, timings=dict(timings))
+    release_job(job_id)
+
+def fail_job(job_id, error, timings):
+    logger.error("🔴 Job %s failed: %s", job_id, error)
+    update_job(job_id, status="failed", error=str(error), timings=dict(timings))
+    release_job(job_id)
+
+def run_job(job_id, session_id, rss_url, num_entries, before_seq=None):
+    """Generate one page; with before_seq None, the page after the session's stored cursor"""
+    timings = start_job_timings()  # Runs in a fresh context, see submit_job
+    try:
+        start_job(job_id)
+        with stage_span("job"):
+            page = process_rss_entries(
+                rss_url,
+                before_seq=job_start_seq(session_id, rss_url, before_seq),
+                num_entries=num_entries,
+                on_reel=lambda reel: add_job_reel(job_id, reel),
+                session_id=session_id,
+            )
+        finish_job(job_id, session_id, rss_url, before_seq, page, timings)
+    except Exception as e:
+        fail_job(job_id, e, timings)
+    maybe_collect_garbage()
+
+def submit_job(session_id, rss_url, num_entries=3, before_seq=None, page=None):
+    """Queue a generation run for the session's next page and return its job id straight away.
+
+    With page, the job is claimed as that API page's job, unless another process
+    claimed it first: then that job's id is returned and nothing is queued.
+    Under the async server the job runs as a task on its loop, otherwise on job_executor.
+    """
+    job_id = uuid.uuid4().hex
+    loop = serving_loop
+    reserve_job(job_id, MAX_ACTIVE_JOBS if loop is None else ASYNC_MAX_ACTIVE_JOBS)
+    try:
+        if page is None:
+            state.create_job(job_id, new_job(rss_url))
+        else:
+            claimed = state.claim_page(page, job_id, new_job(rss_url))
+            if claimed != job_id:
+                release_job(job_id)
+                return claimed
+    except BaseException:
+        release_job(job_id)
+        raise
+    if loop is None:
+        job_executor.submit(contextvars.Context().run, run_job, job_id, session_id, rss_url, num_entries, before_seq)
+    else:
+        import asyncio
+        asyncio.run_coroutine_threadsafe(run_job_async(job_id, session_id, rss_url, num_entries, before_seq), loop)
+    return job_id
+
+def cursor_signing_key():
+    """The cursor HMAC key: CHRONICAL_SECRET_KEY, else the host's generated key file"""
+    global cursor_key
+    with cursor_key_lock:
+        if cursor_key is None:
+            if CURSOR_SECRET_KEY:
+                cursor_key = CURSOR_SECRET_KEY.encode("utf-8")
+            else:
+                tmp_path = f"{CURSOR_KEY_PATH}.{uuid.uuid4().hex}.tmp"
+                with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "wb") as f:
+                    f.write(os.urandom(32))
+                try:
+                    os.link(tmp_path, CURSOR_KEY_PATH)  # Atomic, and the first process to link it wins
+                except FileExistsError:
+                    pass
+                finally:
+                    os.unlink(tmp_path)
+                cursor_key = CURSOR_KEY_PATH.read_bytes()
+        return cursor_key
+
+def sign_cursor(payload):
+    return hmac.new(cursor_signing_key(), payload, hashlib.sha256).digest()[:CURSOR_SIGNATURE_BYTES]
+
+def b64encode_url(data):
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+def b64decode_url(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+def encode_cursor(session_id, rss_url, before_seq):
+    """Signed API cursor for a page of a configured feed"""
+    payload = json.dumps([session_id, feed_selection(rss_url), before_seq], separators=(",", ":")).encode("utf-8")
+    return f"{b64encode_url(payload)}.{b64encode_url(sign_cursor(payload))}"
+
+def decode_cursor(cursor):
+    """(session_id, rss_url, before_seq) from an API cursor; ValueError if it is malformed, forged or names no feed"""
+    try:
+        payload, signature = (b64decode_url(part) for part in cursor.split("."))
+        if not hmac.compare_digest(signature, sign_cursor(payload)):
+            raise ValueError("Bad signature")
+        session_id, selection, before_seq = json.loads(payload)
+        if not (isinstance(session_id, str) and isinstance(selection, str) and isinstance(before_seq, int)):
+            raise ValueError("Bad fields")
+        rss_url = selected_feed_url(selection)
+    except (TypeError, ValueError, IndexError) as e:
+        raise ValueError("Invalid cursor") from e
+    return session_id, rss_url, before_seq
+
+def submit_page(session_id, rss_url, before_seq):
+    """Job id generating one API page, queueing it unless it is already queued, running or done"""
+    page = (session_id, rss_url, before_seq)
+    job_id = state.page_job(page)  # Checked first, so polling a page is never shed
+    if job_id is not None:
+        return job_id
+    return submit_job(session_id, rss_url, num_entries=REEL_PAGE_SIZE, before_seq=before_seq, page=page)
+
+def reel_payload(reels):
+    """API representation of a job's finished reels: summary, keyword and asset URLs"""
+    payload = []
+    for reel in reels:
+        image_filename = reel["image"]
+        stem = image_filename[:-len(".jpg")]
+        srcset = {}
+        for fmt in supported_variant_formats() + ["jpeg"]:
+            urls = []
+            for width in REEL_VARIANT_WIDTHS:
+                filename = image_filename if fmt == "jpeg" and width == CARD_WIDTH else variant_filename(image_filename, width, fmt)
+                urls.append(f"{url_for('reel_asset', filename=filename[len('reels/'):])} {width}w")
+            srcset[fmt] = ", ".join(urls)
+        payload.append({
+            "image": image_filename,
+            "text": reel["text"],
+            "keyword": reel["keyword"],
+            "image_url": url_for('reel_asset', filename=image_filename[len('reels/'):]),
+            "audio_url": url_for('reel_asset', filename=f"{stem[len('reels/'):]}.mp3"),
+            "srcset": srcset,
+        })
+    return payload
 
 # =============================================================================
 # Flask Routes
 # =============================================================================
+@app.before_request
+def ensure_background_workers():
+    create_app()  # No-op once set up; covers servers that import app directly
+    if FEED_REFRESHER:
+        start_feed_refresher()
+
+@app.before_request
+def start_request_timing():
+    stage_timings.set({})
+
+@app.after_request
+def add_server_timing(response):
+    timings = stage_timings.get()
+    if timings and (TIMING_HEADER or request.args.get('timing')):
+        response.headers['Server-Timing'] = format_server_timing(timings)
+    return response
+
+@app.errorhandler(ServerBusy)
+def server_busy(e):
+    logger.warning("⏳ Shedding request: %s", e)
+    response = jsonify({"error": "Server busy, retry shortly", "retry_after": BUSY_RETRY_AFTER_SECONDS})
+    response.headers['Retry-After'] = str(BUSY_RETRY_AFTER_SECONDS)
+    return response, 503
+
 @app.route('/')
 def index():
     return render_template('index.html', rss_feeds=rss_feeds)
 
 @app.route('/process', methods=['POST'])
 def process_feed():
-    selected_index = int(request.form['feed']) - 1
-    selected_url = rss_feeds[selected_index]['url']
-    processed_keywords.clear()
-    feed_entry_counts[selected_url] = 0 # Initialize entry count
-
-    # Clear previous images and audios
-    for f in Path('static/images').glob('*.*'):
-        f.unlink()
-
-    initial_image_files, processed_count_initial = process_rss_entries(selected_url, start_entry_index=0, num_entries=3) # Initial 3
-    feed_entry_counts[selected_url] += processed_count_initial # Update count
-
+    try:
+        selected_url = selected_feed_url(request.form['feed'])
+    except (ValueError, IndexError):
+        return jsonify({"error": "Unknown feed"}), 400
+    session_id = uuid.uuid4().hex  # Only ever inside the cursor: /load_more_images sessions keep their own stored cursor
 
-    all_image_files = initial_image_files # Only send initial 3 to gallery
+    submit_page(session_id, selected_url, 0) # Initial page, generating while the gallery loads
 
-    return redirect(url_for('gallery', image_files=all_image_files, rss_url=selected_url, processed_count=feed_entry_counts[selected_url])) # Pass filenames and rss_url
+    return redirect(url_for('gallery', cursor=encode_cursor(session_id, selected_url, 0), rss_url=selected_url, processed_count=0)) # Gallery pages through /api/reels
 
 @app.route('/load_more_images')
 def load_more_images():
     rss_url = request.args.get('rss_url')
     if not rss_url:
         return jsonify({"error": "RSS URL is missing"}), 400
+    if feed_selection(rss_url) is None:
+        return jsonify({"error": "Unknown feed"}), 400
+    session_id = request.args.get('session_id')
+    if not session_id:
+        return jsonify({"error": "Session id is missing"}), 400
+
+    job_id = submit_job(session_id, rss_url, num_entries=3) # Load next 3
 
-    start_index = feed_entry_counts.get(rss_url, 0)
-    generated_image_files, processed_count = process_rss_entries(rss_url, start_entry_index=start_index, num_entries=3) # Load next 3
-    feed_entry_counts[rss_url] += processed_count # Update count
+    return jsonify({"job_id": job_id}), 202
 
-    return jsonify({"image_files": generated_image_files, "processed_count": feed_entry_counts[rss_url]})
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    job = state.get_job(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    response = jsonify({
+        "job_id": job_id,
+        "status": job["status"],
+        "image_files": [reel["image"] for reel in job["reels"]],
+        "processed_count": job["processed_count"],
+        "error": job["error"],
+        "timings_ms": {stage: round(seconds * 1000, 1) for stage, seconds in job["timings"].items()},
+    })
+    if job["timings"] and (TIMING_HEADER or request.args.get('timing')):
+        response.headers['Server-Timing'] = format_server_timing(job["timings"])
+    return response
 
 
+@app.route('/api/reels')
+def reels_api():
+    """One page of reels. Without a cursor, starts a new session on ?feed=<n|all> or ?rss_url= of a configured feed.
+
+    200 with the page and next_cursor (null at the end of the feed) once it is
+    generated, which also starts generating the next page; 202 with the reels
+    finished so far while it is still running, to be polled at the same URL.
+    """
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            session_id, rss_url, before_seq = decode_cursor(cursor)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+    else:
+        if request.args.get('feed'):
+            try:
+                rss_url = selected_feed_url(request.args['feed'])
+            except (ValueError, IndexError):
+                return jsonify({"error": "Unknown feed"}), 400
+        else:
+            rss_url = request.args.get('rss_url')
+        if not rss_url:
+            return jsonify({"error": "Cursor, feed or RSS URL is missing"}), 400
+        if feed_selection(rss_url) is None:
+            return jsonify({"error": "Unknown feed"}), 400
+        session_id, before_seq = uuid.uuid4().hex, 0
+        cursor = encode_cursor(session_id, rss_url, before_seq)
+
+    job_id = submit_page(session_id, rss_url, before_seq)
+    job = state.get_job(job_id)
+    body = {"cursor": cursor, "job_id": job_id, "status": job["status"], "reels": reel_payload(job["reels"])}
+
+    if job["status"] != "done":
+        return jsonify(dict(body, error=job["error"])), 500 if job["status"] == "failed" else 202
+
+    next_seq = job["next_seq"]
+    if next_seq == before_seq and entry_page(rss_url, before_seq, 1):
+        # Nothing consumed although entries remain: the page failed, so let the client retry it
+        state.drop_page((session_id, rss_url, before_seq))
+        return jsonify(dict(body, status="failed", error="Page generation failed")), 500
+    if next_seq and entry_page(rss_url, next_seq, 1):
+        try:
+            submit_page(session_id, rss_url, next_seq)  # Speculatively generate the next page
+        except ServerBusy:
+            logger.debug("⏳ Busy, not prefetching the next page")
+        body["next_cursor"] = encode_cursor(session_id, rss_url, next_seq)
+    else:
+        body["next_cursor"] = None
+    return jsonify(body)
+
+@app.route('/stats')
+def stats():
+    with summary_cache_lock:
+        summary_cache = dict(summary_cache_stats)
+    return jsonify({"summary_cache": summary_cache, "llm": llm_metrics_snapshot()})
+
+
+@app.route('/metrics')
+def metrics():
+    return render_prometheus_metrics(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+@app.route('/reels/<path:filename>')
+def reel_asset(filename):
+    """Fingerprinted reel image or audio, cacheable forever; mp3s support Range requests"""
+    response = send_from_directory(
+        reels_dir.resolve(), filename,
+        conditional=True, etag=filename, max_age=REEL_CACHE_MAX_AGE_SECONDS,
+    )
+    response.cache_control.immutable = True
+    return response
+
 @app.route('/gallery')
 def gallery():
     image_files = request.args.getlist('image_files')
+    cursor = request.args.get('cursor') # First /api/reels page
+    session_id = request.args.get('session_id')
     rss_url = request.args.get('rss_url') # Get rss_url
+    if rss_url and feed_selection(rss_url) is None:
+        return jsonify({"error": "Unknown feed"}), 400
     processed_count = int(request.args.get('processed_count', 0))
 
 
-    return render_template('gallery.html', image_files=image_files, rss_url=rss_url, processed_count=processed_count) # Pass to template
+    return render_template(
+        'gallery.html', image_files=image_files, cursor=cursor, session_id=session_id, rss_url=rss_url, processed_count=processed_count,
+        card_width=CARD_WIDTH, variant_widths=REEL_VARIANT_WIDTHS, variant_formats=supported_variant_formats(),
+    ) # Pass to template
+
+# =============================================================================
+# App Factory
+# =============================================================================
+def ensure_directories():
+    for directory in (output_dir, Path("static/images"), cache_dir, background_cache_dir, audio_cache_dir, reels_dir, manifest_dir):
+        directory.mkdir(parents=True, exist_ok=True)
+
+def preload_dependencies():
+    """Import every lazily loaded pipeline dependency now rather than on first use"""
+    import importlib
+    for module in PRELOADED_MODULES:
+        importlib.import_module(module)
+
+def create_app(preload=None):
+    """Create working directories and session state once per process and return the Flask app"""
+    global state, app_ready
+    with app_setup_lock:
+        if not app_ready:
+            ensure_directories()
+            state = make_state_backend()
+            if PRELOAD_DEPENDENCIES if preload is None else preload:
+                preload_dependencies()
+            app_ready = True
+    return app
+
+# =============================================================================
+# Async Server
+# =============================================================================
+def call_wsgi_app(environ):
+    """(status, headers, body) of the Flask app for one WSGI environ"""
+    response = {}
+    chunks = []
+
+    def start_response(status, headers, exc_info=None):
+        response["status"], response["headers"] = status, headers
+        return chunks.append
+
+    app_iter = app.wsgi_app(environ, start_response)
+    try:
+        chunks.extend(app_iter)
+    finally:
+        if hasattr(app_iter, "close"):
+            app_iter.close()
+    return response["status"], response["headers"], b"".join(chunks)
+
+async def bridge_to_flask(request):
+    """Serve a route without a native handler by running the Flask app in the blocking pool"""
+    import asyncio
+    from aiohttp import web
+    from multidict import CIMultiDict
+    from werkzeug.test import EnvironBuilder
+    builder = EnvironBuilder(
+        path=request.path, base_url=f"{request.scheme}://{request.host}", method=request.method,
+        query_string=request.query_string, headers=list(request.headers.items()), data=await request.read(),
+    )
+    try:
+        environ = builder.get_environ()
+    finally:
+        builder.close()
+    environ["REMOTE_ADDR"] = request.remote or ""
+    status, headers, body = await asyncio.to_thread(call_wsgi_app, environ)
+    return web.Response(status=int(status.split(" ", 1)[0]), headers=CIMultiDict(headers), body=body)
+
+async def serve_reel(request):
+    """Fingerprinted reel image or audio straight off the loop, with the same caching as /reels/"""
+    from aiohttp import web
+    root = reels_dir.resolve()
+    path = (root / request.match_info["filename"]).resolve()
+    if not path.is_relative_to(root) or not path.is_file():
+        raise web.HTTPNotFound()
+    return web.FileResponse(path, headers={"Cache-Control": f"public, max-age={REEL_CACHE_MAX_AGE_SECONDS}, immutable"})
+
+async def start_async_pipeline(web_app):
+    """Bind the HTTP client, stage limits and speech synthesis to the serving loop, then route jobs to it"""
+    global serving_loop, async_http, async_stage_semaphores, async_llm_semaphore, async_render_semaphore, audio_loop, audio_semaphore
+    import asyncio
+    import aiohttp
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=ASYNC_BLOCKING_WORKERS, thread_name_prefix="blocking"))
+    async_http = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=ASYNC_HTTP_CONNECTIONS))
+    async_stage_semaphores = {stage: asyncio.Semaphore(limit) for stage, limit in ASYNC_STAGE_LIMITS.items()}
+    async_llm_semaphore = asyncio.Semaphore(ASYNC_LLM_CONCURRENCY)
+    async_render_semaphore = asyncio.Semaphore(RENDER_QUEUE_LIMIT)
+    with audio_loop_lock:
+        audio_loop = loop
+        audio_semaphore = asyncio.Semaphore(ASYNC_TTS_CONCURRENCY)
+    serving_loop = loop
+    logger.info("⚡ Async pipeline running on the serving loop")
+
+async def stop_async_pipeline(web_app):
+    global serving_loop
+    serving_loop = None  # New jobs go back to job_executor
+    await async_http.close()
+
+def make_async_app():
+    """aiohttp application serving /reels/ natively and every other route through Flask"""
+    from aiohttp import web
+    web_app = web.Application()
+    web_app.router.add_get("/reels/{filename:.+}", serve_reel)
+    web_app.router.add_route("*", "/{tail:.*}", bridge_to_flask)
+    web_app.on_startup.append(start_async_pipeline)
+    web_app.on_cleanup.append(stop_async_pipeline)
+    return web_app
 
 # =============================================================================
 # Main Entry Point
 # =============================================================================
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="AI Chronical news reel generator")
+    parser.add_argument("--pregenerate", action="store_true", help="run the pre-generation worker instead of the web server")
+    parser.add_argument("--async", dest="serve_async", action="store_true", help="serve with aiohttp and run generation jobs on its event loop")
+    args = parser.parse_args()
+
+    create_app()
+    if args.pregenerate:
+        run_pregeneration_worker()
+    elif args.serve_async:
+        from aiohttp import web
+        start_feed_refresher()
+        web.run_app(make_async_app(), host="0.0.0.0", port=5000)
+    else:
+        start_feed_refresher()
+        app.run(host="0.0.0.0", port=5000)
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""Load test: hundreds of sessions generating their first /api/reels page at once.
+
+Starts the app on a local port against benchmarks/fakes.py (local LLM and RSS
+server, stubbed Bing and edge-tts) inside a scratch working directory,
+configures --sessions feeds, opens one session on each at the same moment, and
+polls each one's page until it is generated. Reports page latency, throughput
+and the peak number of generation jobs running at the same time in the one
+server process.
+
+    async     python app.py --async: jobs are coroutines on the aiohttp loop
+    threaded  the Flask server, jobs on job_executor (MAX_ACTIVE_JOBS is raised
+              to --sessions so the comparison measures queueing, not shedding)
+
+Cards are rendered without the AVIF/WebP variants unless --variants is given;
+even so, on a one-CPU machine page latency is mostly render processes' CPU
+time, since every page also prefetches the next. With --max-p95 the exit status
+is non-zero when the p95 page latency is over the limit.
+
+    python benchmarks/bench_async_load.py --mode async --sessions 300
+    python benchmarks/bench_async_load.py --mode threaded --sessions 300
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from fakes import Behaviour, FakeServices, install_stubs  # noqa: E402
+
+SAMPLE_SECONDS = 0.05
+PAGE_TIMEOUT_SECONDS = 600
+DRAIN_TIMEOUT_SECONDS = 120
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def running_jobs(app):
+    with app.jobs_lock:
+        return sum(status == "running" for status in app.active_jobs.values())
+
+
+def start_async_server(app):
+    """Run app.make_async_app() on its own loop thread; returns (port, stop)"""
+    from aiohttp import web
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(app.make_async_app())
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    loop.run_until_complete(site.start())
+    port = runner.addresses[0][1]
+    threading.Thread(target=loop.run_forever, name="serving-loop", daemon=True).start()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+    return port, stop
+
+
+def start_threaded_server(app, sessions):
+    """Serve the Flask app with werkzeug's threaded server; returns (port, stop)"""
+    from werkzeug.serving import make_server
+    app.MAX_ACTIVE_JOBS = max(app.MAX_ACTIVE_JOBS, sessions)
+    server = make_server("127.0.0.1", 0, app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="werkzeug", daemon=True).start()
+
+    def stop():
+        server.shutdown()
+        app.job_executor.shutdown(wait=True, cancel_futures=True)
+
+    return server.server_port, stop
+
+
+async def run_session(http, base_url, feed, poll, stats):
+    """Request a new session's first page of rss_feeds[feed - 1] and poll it until generated; returns (seconds, reels)"""
+    started = time.perf_counter()
+    params = {"feed": str(feed)}
+    deadline = time.monotonic() + PAGE_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        async with http.get(f"{base_url}/api/reels", params=params) as response:
+            body = await response.json()
+        if response.status == 200:
+            return time.perf_counter() - started, len(body["reels"])
+        if response.status == 503:
+            stats["shed"] += 1
+            await asyncio.sleep(body.get("retry_after", 1))
+            continue
+        if response.status != 202:
+            raise RuntimeError(f"{response.status}: {body.get('error')}")
+        params = {"cursor": body["cursor"]}
+        await asyncio.sleep(poll)
+    raise TimeoutError("Page did not finish")
+
+
+async def run_load(app, base_url, poll):
+    import aiohttp
+    stats = {"shed": 0, "peak_running": 0}
+    done = asyncio.Event()
+
+    async def sample():
+        while not done.is_set():
+            stats["peak_running"] = max(stats["peak_running"], running_jobs(app))
+            await asyncio.sleep(SAMPLE_SECONDS)
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as http:
+        sampler = asyncio.create_task(sample())
+        started = time.perf_counter()
+        sessions = (run_session(http, base_url, feed, poll, stats) for feed in range(1, len(app.rss_feeds) + 1))
+        results = await asyncio.gather(*sessions, return_exceptions=True)
+        wall = time.perf_counter() - started
+        done.set()
+        await sampler
+    return results, wall, stats
+
+
+def drain(app):
+    """Wait for the speculative next-page jobs while the fake services are still up"""
+    deadline = time.monotonic() + DRAIN_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        with app.jobs_lock:
+            if not app.active_jobs:
+                return
+        time.sleep(0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("async", "threaded"), default="async")
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--page-size", type=int, default=1, help="override REEL_PAGE_SIZE")
+    parser.add_argument("--poll", type=float, default=1.5, help="seconds between polls of a pending page, as the gallery")
+    parser.add_argument("--llm-latency", type=float, default=1.0)
+    parser.add_argument("--rss-latency", type=float, default=0.2)
+    parser.add_argument("--image-latency", type=float, default=0.5)
+    parser.add_argument("--tts-latency", type=float, default=1.0)
+    parser.add_argument("--jitter", type=float, default=0.2, help="uniform jitter added to every latency")
+    parser.add_argument("--llm-rate", type=float, default=1000.0, help="override LLM_RATE_PER_SECOND")
+    parser.add_argument("--variants", action="store_true", help="also encode the AVIF/WebP card variants")
+    parser.add_argument("--max-p95", type=float, default=None, help="fail if the p95 page latency exceeds this many seconds")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="chronical-load-")
+    shutil.copy(ROOT / "Muroslant.otf", workdir)
+    os.chdir(workdir)  # The app keeps images/, static/ and cache/ relative to the working directory
+    os.environ.setdefault("CHRONICAL_LOG_LEVEL", "WARNING")
+    import app  # noqa: E402
+    app.create_app()
+
+    services = FakeServices(llm=Behaviour(args.llm_latency, args.jitter), rss=Behaviour(args.rss_latency, args.jitter))
+    with services:
+        install_stubs(
+            app, services, ROOT / "images",
+            image=Behaviour(args.image_latency, args.jitter),
+            tts=Behaviour(args.tts_latency, args.jitter),
+        )
+        app.LLM_RATE_PER_SECOND = args.llm_rate
+        app.REEL_PAGE_SIZE = args.page_size
+        if not args.variants:
+            app.REEL_VARIANT_FORMATS = ()
+
+        if args.mode == "async":
+            port, stop = start_async_server(app)
+        else:
+            port, stop = start_threaded_server(app, args.sessions)
+        app.rss_feeds = [{"name": f"Load {i}", "url": services.feed_url(f"load-{i}")} for i in range(args.sessions)]
+        results, wall, stats = asyncio.run(run_load(app, f"http://127.0.0.1:{port}", args.poll))
+        drain(app)
+        stop()
+
+    errors = [r for r in results if isinstance(r, BaseException)]
+    pages = [r for r in results if not isinstance(r, BaseException)]
+    latencies = [seconds for seconds, _ in pages]
+    print(f"workdir {workdir}, mode {args.mode}, {args.sessions} sessions, {args.page_size} entries per page")
+    if latencies:
+        print(f"{'p50 s':>8} {'p95 s':>8} {'max s':>8} {'mean s':>8} {'pages/s':>8} {'reels':>6} {'peak jobs':>10} {'shed':>6} {'errors':>7}")
+        print(f"{percentile(latencies, 0.50):8.3f} {percentile(latencies, 0.95):8.3f} {max(latencies):8.3f} "
+              f"{statistics.mean(latencies):8.3f} {len(latencies) / wall:8.2f} {sum(reels for _, reels in pages):6d} "
+              f"{stats['peak_running']:10d} {stats['shed']:6d} {len(errors):7d}")
+    for error in errors[:3]:
+        print(f"error: {error!r}")
+    print(f"upstream requests: {services.requests}")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+    failed = bool(errors) or not latencies or (args.max_p95 is not None and percentile(latencies, 0.95) > args.max_p95)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Cold-start benchmark: a fresh interpreter importing the app and serving /.
+
+Runs each startup mode in new processes under `python -X importtime`, from an
+empty working directory, and reports the median time to import app, run
+create_app() and answer the first GET /, the pipeline dependencies loaded by
+then, and the slowest top-level imports.
+
+    lazy     default: pipeline dependencies load on first use
+    preload  CHRONICAL_PRELOAD=1: everything imported up front, as app.py did
+             before the lazy imports
+
+    python benchmarks/bench_cold_start.py [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODES = {"preload": "1", "lazy": "0"}
+HEAVY_MODULES = ("requests", "feedparser", "PIL.Image", "bing_image_downloader.downloader", "edge_tts", "asyncio")
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+flask_app = app.create_app()
+created = time.perf_counter()
+response = flask_app.test_client().get('/')
+served = time.perf_counter()
+assert response.status_code == 200, response.status_code
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"import": imported - started, "create_app": created - imported, "first_request": served - created, "loaded": heavy}}))
+"""
+
+
+def parse_importtime(stderr):
+    """{module: cumulative microseconds} for the top-level imports in -X importtime output"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name[1:].startswith(" "):  # Nested imports are indented
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def run_once(mode, workdir):
+    env = dict(os.environ, PYTHONPATH=str(ROOT), CHRONICAL_PRELOAD=MODES[mode], CHRONICAL_LOG_LEVEL="WARNING")
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(heavy=HEAVY_MODULES)],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - started
+    phases = json.loads(result.stdout.strip().splitlines()[-1])
+    return dict(phases, wall=wall), parse_importtime(result.stderr)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'mode':<8} {'import ms':>10} {'create ms':>10} {'GET / ms':>10} {'to / ms':>10} {'process ms':>11}")
+    slowest = {}
+    for mode in MODES:
+        samples = []
+        for _ in range(runs):
+            with tempfile.TemporaryDirectory(prefix="chronical-cold-") as workdir:
+                sample, modules = run_once(mode, workdir)
+            samples.append(sample)
+        slowest[mode] = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:5]
+
+        def median(field):
+            return statistics.median(sample[field] for sample in samples) * 1000
+
+        to_first_response = statistics.median(s["import"] + s["create_app"] + s["first_request"] for s in samples) * 1000
+        print(f"{mode:<8} {median('import'):10.1f} {median('create_app'):10.1f} {median('first_request'):10.1f} "
+              f"{to_first_response:10.1f} {median('wall'):11.1f}   loaded: {', '.join(samples[-1]['loaded']) or 'none'}")
+
+    for mode, modules in slowest.items():
+        print(f"\nslowest top-level imports ({mode}, last run):")
+        for name, microseconds in modules:
+            print(f"  {name:<40} {microseconds / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
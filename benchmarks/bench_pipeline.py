@@ -0,0 +1,197 @@
+"""Offline end-to-end benchmark of the reel pipeline.
+
+Runs the app against benchmarks/fakes.py (local LLM and RSS server, stubbed
+Bing and edge-tts) inside a scratch working directory, so no network access
+is needed and caches start cold. Scenarios:
+
+    process    POST /process, then poll the job until the first reels finish
+    load_more  /load_more_images on an existing session, polled to completion
+    next_page  the next /api/reels page of a session, --think-time seconds after
+               its first page (the server prefetches it meanwhile)
+    render     create_news_image alone (image lookup + card render)
+
+Reports p50/p95 latency and throughput per scenario. With --max-p95 the exit
+status is non-zero when any scenario's p95 is over the limit.
+
+    python benchmarks/bench_pipeline.py --iterations 20 --concurrency 4 --llm-latency 0.5
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from fakes import Behaviour, FakeServices, install_stubs  # noqa: E402
+
+JOB_POLL_SECONDS = 0.02
+JOB_TIMEOUT_SECONDS = 300
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def wait_for_job(client, job_id):
+    """Poll /jobs/<id> until the job ends, and return its status"""
+    deadline = time.monotonic() + JOB_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        job = client.get(f"/jobs/{job_id}").get_json()
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(JOB_POLL_SECONDS)
+    raise TimeoutError(f"Job {job_id} did not finish")
+
+
+def wait_for_page(client, cursor):
+    """Poll /api/reels for one page until it is generated, and return its body"""
+    deadline = time.monotonic() + JOB_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        response = client.get("/api/reels", query_string={"cursor": cursor})
+        if response.status_code != 202:
+            return response.get_json()
+        time.sleep(JOB_POLL_SECONDS)
+    raise TimeoutError("Page did not finish")
+
+
+def start_session(app, feed_number):
+    """POST /process for one feed and wait for its first page; returns (client, page)"""
+    client = app.app.test_client()
+    response = client.post("/process", data={"feed": str(feed_number)})
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(response.headers["Location"]).query)
+    return client, wait_for_page(client, query["cursor"][0])
+
+
+def scenario_process(app, i):
+    _, page = start_session(app, i + 1)
+    return len(page["reels"])
+
+
+def scenario_load_more(app, i):
+    """The second /load_more_images page of a session; the first one starts it"""
+    client = app.app.test_client()
+    query = {"rss_url": app.rss_feeds[i]["url"], "session_id": uuid.uuid4().hex}
+    wait_for_job(client, client.get("/load_more_images", query_string=query).get_json()["job_id"])
+    started = time.perf_counter()
+    job = wait_for_job(client, client.get("/load_more_images", query_string=query).get_json()["job_id"])
+    return len(job["image_files"]), time.perf_counter() - started
+
+
+def scenario_next_page(app, i, think_time=0.0):
+    client, page = start_session(app, i + 1)
+    time.sleep(think_time)  # The next page is being prefetched meanwhile
+    started = time.perf_counter()
+    page = wait_for_page(client, page["next_cursor"])
+    return len(page["reels"]), time.perf_counter() - started
+
+
+def scenario_render(app, i):
+    app.create_news_image(f"Benchmark card number {i} with a summary long enough to wrap twice", f"keyword{i % 7}", f"reels/bench{i}.jpg")
+    return 1
+
+
+SCENARIOS = {"process": scenario_process, "load_more": scenario_load_more, "next_page": scenario_next_page, "render": scenario_render}
+
+
+def run_scenario(app, name, iterations, concurrency, offset, think_time=0.0):
+    latencies = []
+    reels = []
+    lock = threading.Lock()
+
+    def one(i):
+        started = time.perf_counter()
+        if name == "next_page":
+            result = scenario_next_page(app, offset + i, think_time)
+        else:
+            result = SCENARIOS[name](app, offset + i)
+        elapsed = time.perf_counter() - started
+        if isinstance(result, tuple):  # Scenario timed its own critical section
+            result, elapsed = result
+        with lock:
+            latencies.append(elapsed)
+            reels.append(result)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(iterations)))
+    wall = time.perf_counter() - started
+    return {
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "mean": statistics.mean(latencies),
+        "throughput": iterations / wall,
+        "reels": sum(reels),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", default="process,load_more,next_page,render")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--llm-failure-rate", type=float, default=0.0)
+    parser.add_argument("--llm-rate", type=float, default=None, help="override LLM_RATE_PER_SECOND")
+    parser.add_argument("--rss-latency", type=float, default=0.05)
+    parser.add_argument("--image-latency", type=float, default=0.3)
+    parser.add_argument("--image-failure-rate", type=float, default=0.0)
+    parser.add_argument("--tts-latency", type=float, default=0.5)
+    parser.add_argument("--tts-failure-rate", type=float, default=0.0)
+    parser.add_argument("--think-time", type=float, default=0.0, help="seconds between a session's first page and next_page")
+    parser.add_argument("--jitter", type=float, default=0.1, help="uniform jitter added to every latency")
+    parser.add_argument("--max-p95", type=float, default=None, help="fail if any scenario's p95 exceeds this many seconds")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="chronical-bench-")
+    shutil.copy(ROOT / "Muroslant.otf", workdir)
+    os.chdir(workdir)  # The app keeps images/, static/ and cache/ relative to the working directory
+    os.environ.setdefault("CHRONICAL_LOG_LEVEL", "WARNING")
+    import app  # noqa: E402
+    app.create_app()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    services = FakeServices(
+        llm=Behaviour(args.llm_latency, args.jitter, args.llm_failure_rate),
+        rss=Behaviour(args.rss_latency, args.jitter),
+    )
+    with services:
+        install_stubs(
+            app, services, ROOT / "images",
+            image=Behaviour(args.image_latency, args.jitter, args.image_failure_rate),
+            tts=Behaviour(args.tts_latency, args.jitter, args.tts_failure_rate),
+        )
+        if args.llm_rate is not None:
+            app.LLM_RATE_PER_SECOND = args.llm_rate
+        # One fake feed per iteration and scenario, so every run starts with cold caches
+        feeds = args.iterations * len(scenarios)
+        app.rss_feeds = [{"name": f"Bench {i}", "url": services.feed_url(f"bench-{i}")} for i in range(feeds)]
+
+        print(f"workdir {workdir}, {args.iterations} iterations x {args.concurrency} concurrent")
+        print(f"{'scenario':<10} {'p50 s':>8} {'p95 s':>8} {'mean s':>8} {'ops/s':>8} {'reels':>6}")
+        failed = False
+        for n, name in enumerate(scenarios):
+            result = run_scenario(app, name, args.iterations, args.concurrency, n * args.iterations, args.think_time)
+            print(f"{name:<10} {result['p50']:8.3f} {result['p95']:8.3f} {result['mean']:8.3f} {result['throughput']:8.2f} {result['reels']:6d}")
+            if args.max_p95 is not None and result["p95"] > args.max_p95:
+                failed = True
+        print(f"upstream requests: {services.requests}")
+        # Let speculative next-page jobs finish while the fake services are still up
+        app.job_executor.shutdown(wait=True, cancel_futures=True)
+
+    shutil.rmtree(workdir, ignore_errors=True)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Micro-benchmark of the card text-overlay renderer.
+
+Compares the original create_news_image overlay code with render_card on the
+same cached background and reports per-image render time.
+
+    python benchmarks/bench_render.py [iterations]
+"""
+import io
+import os
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+os.chdir(ROOT)
+sys.path.insert(0, str(ROOT))
+
+from PIL import Image, ImageDraw, ImageFont  # noqa: E402
+
+import app  # noqa: E402
+
+app.ensure_directories()
+
+TEXT = "Scientists confirm the mini moon will leave Earth's orbit next week after a two month visit"
+
+
+def legacy_render(text, background, output):
+    """The overlay code create_news_image used before render_card"""
+    canvas = background
+    canvas_width, canvas_height = canvas.size
+    overlay = Image.new('RGBA', canvas.size, (0, 0, 0, 128))
+    canvas = canvas.convert('RGBA')
+    canvas.paste(overlay, (0, 0), overlay)
+
+    draw = ImageDraw.Draw(canvas)
+    try:
+        font = ImageFont.truetype("Muroslant.otf", 36)
+    except:
+        font = ImageFont.load_default()
+
+    wrapped_text = textwrap.wrap(text, width=35)
+    text_height = sum(draw.textbbox((0, 0), line, font=font)[3] for line in wrapped_text)
+    y = (canvas_height - text_height) // 2
+
+    for line in wrapped_text:
+        text_width = draw.textbbox((0, 0), line, font=font)[2]
+        x = (canvas_width - text_width) // 2
+        draw.text((x, y), line, font=font, fill="white")
+        y += draw.textbbox((0, 0), line, font=font)[3] + 5
+
+    canvas = canvas.convert('RGB')
+    canvas.save(output, format="JPEG")
+
+
+def time_per_image(render, background, iterations):
+    render(TEXT, background, io.BytesIO())  # Warm up font and codec state
+    started = time.perf_counter()
+    for _ in range(iterations):
+        render(TEXT, background, io.BytesIO())
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    source = next(Path("images").glob("*/Image_1.jpg"))
+    background = app.load_background(source)
+
+    before = time_per_image(legacy_render, background, iterations)
+    after = time_per_image(app.render_card, background, iterations)
+    progressive = time_per_image(lambda t, b, o: app.render_card(t, b, o, progressive=True), background, iterations)
+
+    print(f"background: {source} ({iterations} iterations)")
+    print(f"before (RGBA overlay, 3x textbbox per line): {before:7.2f} ms/image")
+    print(f"after  (point LUT, 1x getbbox per line):     {after:7.2f} ms/image  ({before / after:.2f}x)")
+    print(f"after, progressive JPEG:                     {progressive:7.2f} ms/image")
+
+
+if __name__ == "__main__":
+    main()
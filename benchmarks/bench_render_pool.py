@@ -0,0 +1,85 @@
+"""Throughput benchmark for the card render process pool.
+
+Renders the same batch of cards through app.submit_render with 1, 2, 4, ...
+worker processes, up to the host's core count, and reports images/sec for each
+pool size. Each size gets a fresh app render pool and a render queue of
+RENDER_QUEUE_LIMIT slots per worker, as the app sizes them, so the time spent
+waiting for a free queue slot is part of the measurement.
+
+    python benchmarks/bench_render_pool.py [cards]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+os.chdir(ROOT)
+sys.path.insert(0, str(ROOT))
+
+import app  # noqa: E402
+
+app.ensure_directories()
+
+TEXT = "Scientists confirm the mini moon will leave Earth's orbit next week after a two month visit"
+
+
+def pool_sizes():
+    cores = os.cpu_count() or 1
+    size = 1
+    while size < cores:
+        yield size
+        size *= 2
+    yield cores
+
+
+def use_render_pool(workers):
+    """Point the app at a new render pool of `workers` processes with a queue sized as the app sizes it"""
+    if app.render_pool is not None:
+        app.render_pool.shutdown()
+    app.render_pool = None
+    app.RENDER_WORKERS = workers
+    app.RENDER_QUEUE_LIMIT = workers * 4
+    app.render_slots = threading.BoundedSemaphore(app.RENDER_QUEUE_LIMIT)
+
+
+def run(workers, backgrounds, cards, out_dir):
+    """(images/sec, seconds spent waiting for a render queue slot) for one pool size"""
+    use_render_pool(workers)
+    # Start every worker and load its font before timing
+    warm = [app.submit_render(TEXT, backgrounds[0], os.path.join(out_dir, f"warm{i}.jpg")) for i in range(workers)]
+    for future in warm:
+        future.result()
+
+    queued = 0.0
+    started = time.perf_counter()
+    futures = []
+    for i in range(cards):
+        submitted = time.perf_counter()
+        futures.append(app.submit_render(TEXT, backgrounds[i % len(backgrounds)], os.path.join(out_dir, f"card{i}.jpg")))
+        queued += time.perf_counter() - submitted
+    for future in futures:
+        future.result()
+    return cards / (time.perf_counter() - started), queued
+
+
+def main():
+    cards = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    backgrounds = [str(p) for p in sorted(Path("images").glob("*/Image_1.*"))[:20]]
+    for background in backgrounds:
+        app.load_background(background)  # Time rendering, not first-time background preparation
+
+    print(f"{cards} cards, {len(backgrounds)} backgrounds, {os.cpu_count()} cores")
+    with tempfile.TemporaryDirectory() as out_dir:
+        baseline = None
+        for workers in pool_sizes():
+            rate, queued = run(workers, backgrounds, cards, out_dir)
+            baseline = baseline or rate
+            print(f"{workers:3d} workers: {rate:8.1f} images/sec  ({rate / baseline:.2f}x)  {queued:6.2f}s waiting for queue slots")
+        use_render_pool(0)  # Shut the last pool down
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Local stand-ins for the services the pipeline calls, for offline benchmarks.
+
+FakeServices runs one threaded HTTP server that plays both pollinations.ai
+(GET /llm/<prompt>) and the RSS feeds (GET /feed/<name>.xml). install_stubs()
+replaces bing_image_downloader's download and edge-tts's Communicate with
+local fakes.
+Every fake takes a latency (seconds, plus uniform jitter) and a failure rate.
+"""
+import asyncio
+import json
+import random
+import re
+import shutil
+import threading
+import time
+import urllib.parse
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+
+class Behaviour:
+    """Latency and failure settings for one fake dependency"""
+
+    def __init__(self, latency=0.0, jitter=0.0, failure_rate=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+
+    def delay(self):
+        return self.latency + random.uniform(0, self.jitter)
+
+    def fails(self):
+        return random.random() < self.failure_rate
+
+
+def fake_llm_reply(prompt):
+    """What the model would answer: an object, or an array for batched prompts"""
+    titles = re.findall(r"^Title: (.*)$", prompt, flags=re.MULTILINE)
+    summaries = [
+        {"id": i, "text": f"Summary of {title}", "keyword": title.split()[-1] if title.split() else "news"}
+        for i, title in enumerate(titles, start=1)
+    ]
+    if "JSON array" in prompt:
+        return json.dumps(summaries)
+    summary = summaries[0] if summaries else {"text": "Nothing happened", "keyword": "news"}
+    return json.dumps({"text": summary["text"], "keyword": summary["keyword"]})
+
+
+def fake_feed_xml(name, entries):
+    items = "".join(
+        "<item>"
+        f"<title>{escape(f'{name} story topic{i}')}</title>"
+        f"<link>https://example.invalid/{escape(name)}/{i}</link>"
+        f"<guid>{escape(name)}-{i}</guid>"
+        f"<description>{escape(f'Details of {name} story number {i}.')}</description>"
+        f"<pubDate>{formatdate(time.time() - i * 60)}</pubDate>"
+        "</item>"
+        for i in range(entries)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>{escape(name)}</title>{items}</channel></rss>'
+
+
+class FakeServices:
+    """Threaded local HTTP server for the LLM endpoint and RSS feeds"""
+
+    def __init__(self, llm=None, rss=None, feed_entries=20):
+        self.llm = llm or Behaviour()
+        self.rss = rss or Behaviour()
+        self.feed_entries = feed_entries
+        self.requests = {"llm": 0, "rss": 0}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    @property
+    def llm_url(self):
+        return f"{self.base_url}/llm/"
+
+    def feed_url(self, name):
+        return f"{self.base_url}/feed/{urllib.parse.quote(name)}.xml"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _count(self, kind):
+        with self._lock:
+            self.requests[kind] += 1
+
+    def _handler(self):
+        services = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body, content_type):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                path = urllib.parse.urlparse(self.path).path
+                if path.startswith("/llm/"):
+                    services._count("llm")
+                    behaviour, reply = services.llm, lambda: (fake_llm_reply(urllib.parse.unquote(path[len("/llm/"):])), "text/plain")
+                elif path.startswith("/feed/"):
+                    services._count("rss")
+                    name = urllib.parse.unquote(path[len("/feed/"):]).rsplit(".", 1)[0]
+                    behaviour, reply = services.rss, lambda: (fake_feed_xml(name, services.feed_entries), "application/rss+xml")
+                else:
+                    return self._reply(404, "not found", "text/plain")
+
+                time.sleep(behaviour.delay())
+                if behaviour.fails():
+                    return self._reply(503, "unavailable", "text/plain")
+                body, content_type = reply()
+                self._reply(200, body, content_type)
+
+        return Handler
+
+
+class FakeCommunicate:
+    """Drop-in for edge_tts.Communicate that streams a few fake mp3 chunks"""
+
+    behaviour = Behaviour()
+
+    def __init__(self, text, voice):
+        self.text = text
+
+    async def stream(self):
+        await asyncio.sleep(self.behaviour.delay())
+        if self.behaviour.fails():
+            raise ConnectionError("fake edge-tts failure")
+        for i in range(4):
+            yield {"type": "audio", "data": f"{self.text}:{i}".encode("utf-8") * 64}
+
+
+def make_fake_download(source_images, behaviour):
+    """Drop-in for bing_image_downloader.downloader.download that copies local images"""
+    sources = sorted(Path(source_images).glob("*/Image_1.*"))
+
+    def download(query, limit=2, output_dir="images", adult_filter_off=True, force_replace=False, timeout=60, **kwargs):
+        time.sleep(behaviour.delay())
+        if behaviour.fails() or not sources:
+            return
+        folder = Path(output_dir) / query
+        folder.mkdir(parents=True, exist_ok=True)
+        for i in range(limit):
+            source = random.choice(sources)
+            shutil.copyfile(source, folder / f"Image_{i + 1}{source.suffix}")
+
+    return download
+
+
+def install_stubs(app, services, source_images, image=None, tts=None):
+    """Point an imported app module at the fake services and stub out Bing and edge-tts.
+
+    The app imports both libraries lazily, so the stubs go on the library modules.
+    """
+    import edge_tts
+    from bing_image_downloader import downloader
+
+    app.LLM_BASE_URL = services.llm_url
+    downloader.download = make_fake_download(source_images, image or Behaviour())
+    FakeCommunicate.behaviour = tts or Behaviour()
+    edge_tts.Communicate = FakeCommunicate
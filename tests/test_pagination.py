@@ -0,0 +1,94 @@
+"""A page whose summaries fail must not advance the cursor past those entries."""
+import time
+
+import pytest
+
+import app as chronical
+
+FEED_URL = "http://feeds.example/pagination.xml"
+
+
+@pytest.fixture
+def feed(tmp_path, monkeypatch):
+    """Five indexed entries (seq 1 to 5, entry-4 the newest) and a pipeline that renders nothing"""
+    monkeypatch.chdir(tmp_path)  # The app keeps images/, static/ and cache/ relative to the working directory
+    chronical.create_app()
+    chronical.ensure_directories()
+    chronical.ingest_entries(FEED_URL, [{"id": f"entry-{i}", "title": f"Story topic{i}"} for i in reversed(range(5))])
+    monkeypatch.setattr(chronical, "rss_feeds", [{"name": "Pagination", "url": FEED_URL}])
+    monkeypatch.setattr(chronical, "get_feed_entries", lambda rss_url: [])
+    monkeypatch.setattr(chronical, "render_reels", render_instantly)
+    return chronical
+
+
+def render_instantly(reels, on_reel=None):
+    """A render_reels that reports every reel finished without writing anything"""
+    for image_filename, _, _ in reels:
+        if on_reel:
+            on_reel(image_filename)
+    return [image_filename for image_filename, _, _ in reels]
+
+
+def summarise_except(failing, failure=None):
+    """A summarise_entries that returns failure (None: the request failed) for the titles in failing"""
+    def summarise_entries(items):
+        return [failure if title in failing else {"text": title, "keyword": title.split()[-1]} for title, _ in items]
+    return summarise_entries
+
+
+def wait_for_page(client, query):
+    response = client.get("/api/reels", query_string=query)
+    deadline = time.monotonic() + 10
+    while response.status_code == 202 and time.monotonic() < deadline:
+        time.sleep(0.05)
+        response = client.get("/api/reels", query_string={"cursor": response.get_json()["cursor"]})
+    return response
+
+
+def test_failed_page_keeps_cursor(feed, monkeypatch):
+    monkeypatch.setattr(feed, "summarise_entries", summarise_except({f"Story topic{i}" for i in range(5)}))
+    generated_files, processed_count, next_seq = feed.process_rss_entries(FEED_URL, 0, 3, session_id="failing")
+    assert (generated_files, processed_count, next_seq) == ([], 0, 0)
+
+
+def test_page_stops_at_first_failed_summary(feed, monkeypatch):
+    monkeypatch.setattr(feed, "summarise_entries", summarise_except({"Story topic3"}))
+    generated_files, processed_count, next_seq = feed.process_rss_entries(FEED_URL, 0, 3, session_id="partial")
+    assert processed_count == 1 and next_seq == 5  # Only entry-4 is consumed; entry-3 is retried
+
+    monkeypatch.setattr(feed, "summarise_entries", summarise_except(set()))
+    generated_files, processed_count, next_seq = feed.process_rss_entries(FEED_URL, next_seq, 3, session_id="partial")
+    assert processed_count == 3 and next_seq == 2
+
+
+def test_api_reports_failed_page(feed, monkeypatch):
+    monkeypatch.setattr(feed, "summarise_entries", summarise_except({f"Story topic{i}" for i in range(5)}))
+    response = wait_for_page(feed.app.test_client(), {"feed": "1"})
+    assert response.status_code == 500
+    assert "next_cursor" not in response.get_json()
+
+
+def test_always_failing_entry_is_skipped(feed, monkeypatch):
+    monkeypatch.setattr(feed, "summarise_entries", summarise_except({"Story topic4"}))
+    client = feed.app.test_client()
+    for _ in range(feed.ENTRY_MAX_SUMMARY_FAILURES - 1):
+        assert wait_for_page(client, {"feed": "1"}).status_code == 500  # Held, in case the failure was transient
+
+    response = wait_for_page(client, {"feed": "1"})
+    assert response.status_code == 200
+    assert [reel["keyword"] for reel in response.get_json()["reels"]] == ["topic3", "topic2"]
+    assert wait_for_page(client, {"cursor": response.get_json()["next_cursor"]}).get_json()["reels"][0]["keyword"] == "topic1"
+
+
+def test_unparseable_summary_is_skipped(feed, monkeypatch):
+    monkeypatch.setattr(feed, "summarise_entries", summarise_except({"Story topic4"}, feed.NO_SUMMARY))
+    generated_files, processed_count, next_seq = feed.process_rss_entries(FEED_URL, 0, 3, session_id="unparseable")
+    assert processed_count == 2 and next_seq == 3
+
+
+def test_process_hands_out_only_the_api_cursor(feed, monkeypatch):
+    monkeypatch.setattr(feed, "summarise_entries", summarise_except(set()))
+    client = feed.app.test_client()
+    query = dict(part.split("=", 1) for part in client.post("/process", data={"feed": "1"}).headers["Location"].split("?", 1)[1].split("&"))
+    assert "session_id" not in query  # /load_more_images would otherwise replay the pages /api/reels serves
+    assert wait_for_page(client, {"cursor": query["cursor"]}).status_code == 200